@@ -39,15 +39,21 @@ if DEBUG:
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Must be near the top
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # Session, CSRF and messages, except on public pages (frontend/middleware.py)
+    "frontend.middleware.PublicSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
+    "frontend.middleware.PublicCsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "frontend.middleware.PublicMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_browser_reload.middleware.BrowserReloadMiddleware",
 ]
 
+# GET/HEAD requests for views in these apps never read or set cookies, so
+# shared caches can store them. The admin is unaffected.
+PUBLIC_PAGES_COOKIELESS = config("PUBLIC_PAGES_COOKIELESS", default=True, cast=bool)
+PUBLIC_PAGE_APPS = ["frontend"]
+
 ROOT_URLCONF = "aesl.urls"
 
 TEMPLATES = [
@@ -75,6 +81,75 @@ DATABASES = {
     }
 }
 
+# Caches. "views" holds whole rendered pages (frontend/cache.py): a small
+# per-process LRU (frontend/cache_backend.py) in front of "shared". Local
+# memory is per process, so with several workers or instances point
+# "shared" at a shared backend (e.g. VIEW_CACHE_BACKEND=django.core.cache.
+# backends.redis.RedisCache) or admin edits only invalidate the worker that
+# saved them.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": config(
+            "VIEW_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("VIEW_CACHE_LOCATION", default="views"),
+    },
+    "views": {
+        "BACKEND": "frontend.cache_backend.TieredCache",
+        "VERSION": config("VIEW_CACHE_VERSION", default=1, cast=int),
+        "OPTIONS": {
+            "SHARED": "shared",
+            "MAX_ENTRIES": config("VIEW_CACHE_LOCAL_ENTRIES", default=500, cast=int),
+            "MAX_BYTES": config(
+                "VIEW_CACHE_LOCAL_BYTES", default=32 * 1024 * 1024, cast=int
+            ),
+            "LOCAL_TIMEOUT": 300,
+            # Version stamps change in place; always read them from "shared"
+            "BYPASS_PREFIXES": ["model-version:"],
+        },
+    },
+    # Template fragments ({% cache None ... using="fragments" %}). Their keys
+    # name the content's version (url name, pk + updated_at), so entries are
+    # never stale and are only ever culled. DummyCache in DEBUG keeps
+    # template edits visible.
+    "fragments": {
+        "BACKEND": config(
+            "FRAGMENT_CACHE_BACKEND",
+            default="django.core.cache.backends.dummy.DummyCache"
+            if DEBUG
+            else "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("FRAGMENT_CACHE_LOCATION", default="fragments"),
+        "VERSION": config("VIEW_CACHE_VERSION", default=1, cast=int),
+    },
+}
+
+VIEW_CACHE_ALIAS = "views"
+VIEW_CACHE_ENABLED = config("VIEW_CACHE_ENABLED", default=not DEBUG, cast=bool)
+# Entries are invalidated by model saves; this only bounds pages with no
+# model dependencies (template-only pages pick up a deploy within a day).
+VIEW_CACHE_TIMEOUT = config("VIEW_CACHE_TIMEOUT", default=60 * 60 * 24, cast=int)
+
+# Cache-Control for cacheable public pages (CachedViewMixin). Browsers
+# revalidate every time (ETag / Last-Modified); shared caches keep a page
+# for s_maxage seconds and are purged by Surrogate-Key when a row changes.
+# Views override single entries with `edge_cache_policy`.
+EDGE_CACHE_POLICY = {
+    "max_age": 0,
+    "s_maxage": config("EDGE_CACHE_S_MAXAGE", default=60 * 60, cast=int),
+    "stale_while_revalidate": 60,
+    "stale_if_error": 60 * 60 * 24,
+}
+# Called with the surrogate keys of every saved or deleted row (see
+# frontend/purge.py). The local backend only records them.
+EDGE_PURGE_BACKEND = config(
+    "EDGE_PURGE_BACKEND", default="frontend.purge.LocalPurgeBackend"
+)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -99,6 +174,40 @@ STATICFILES_DIRS = [BASE_DIR / "static"]  # your source static files
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Image processing: when True, uploads are saved as-is and the Pillow work
+# runs in `python manage.py process_image_jobs` instead of the admin request.
+# Only turn it on where a worker or cron job runs that command (nothing on
+# the Vercel deploy does); otherwise uploads never get their renditions.
+IMAGE_JOBS_ASYNC = config("IMAGE_JOBS_ASYNC", default=False, cast=bool)
+
+# Largest image (in decoded pixels, after JPEG draft scaling) the pipeline
+# will load. Keeps a single upload from spiking worker memory.
+IMAGE_MAX_PIXELS = config("IMAGE_MAX_PIXELS", default=40_000_000, cast=int)
+
+# On-demand resizes served from /img/ (frontend/resize.py) are kept here;
+# the least recently used are deleted once the cache passes the byte limit.
+IMAGE_CACHE_DIR = config("IMAGE_CACHE_DIR", default=str(BASE_DIR / "image_cache"))
+IMAGE_CACHE_MAX_BYTES = config(
+    "IMAGE_CACHE_MAX_BYTES", default=256 * 1024 * 1024, cast=int
+)
+
+# `python manage.py export_site` writes every public page here as
+# <path>/index.html, for a static host to serve before Django. Not wired
+# into the Vercel build yet.
+SITE_EXPORT_ROOT = config("SITE_EXPORT_ROOT", default=str(BASE_DIR / "site"))
+# Host header the pages are rendered with; must be in ALLOWED_HOSTS.
+SITE_EXPORT_HOST = config("SITE_EXPORT_HOST", default="localhost")
+# When True, saving a row queues the exported pages that show it and
+# `python manage.py regenerate_pages` re-renders just those, once no edit
+# has touched them for SITE_EXPORT_DEBOUNCE seconds.
+SITE_EXPORT_INCREMENTAL = config("SITE_EXPORT_INCREMENTAL", default=False, cast=bool)
+SITE_EXPORT_DEBOUNCE = config("SITE_EXPORT_DEBOUNCE", default=2.0, cast=float)
+
+# Always stream uploads to a temp file instead of holding them in memory.
+FILE_UPLOAD_HANDLERS = [
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
 # WhiteNoise storage (compressed + manifest for far-future caching)
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import Count
+from django.utils import timezone
 from django.utils.html import format_html
 
 from .models import (
@@ -7,6 +9,7 @@ from .models import (
     Category,
     ContractorRole,
     ExternalAuthor,
+    ImageJob,
     MainCategory,
     NewsArticle,
     NewsImage,
@@ -24,6 +27,7 @@ from .models import (
     SubCategory,
     Alumni,
 )
+from .resize import resized_url
 
 
 # ==================================================
@@ -67,6 +71,7 @@ class ProjectAdmin(admin.ModelAdmin):
         "formatted_start_date",
         "formatted_completed_date",
     )
+    list_select_related = ("category",)
     list_filter = ("category",)
     search_fields = (
         "title",
@@ -211,6 +216,14 @@ class SubCategoryAdmin(admin.ModelAdmin):
     inlines = [StaffInline]
 
 
+class SubCategoryListFilter(admin.RelatedFieldListFilter):
+    # A sub category's name includes its main category's: fetch them together
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        sub_categories = SubCategory.objects.select_related("main_category")
+        return [(sub.pk, str(sub)) for sub in sub_categories.order_by(*ordering)]
+
+
 @admin.register(Staff)
 class StaffAdmin(admin.ModelAdmin):
     list_display = (
@@ -220,7 +233,8 @@ class StaffAdmin(admin.ModelAdmin):
         "email",
         "sub_category",
     )
-    list_filter = ("sub_category", "position")
+    list_select_related = ("sub_category__main_category",)
+    list_filter = (("sub_category", SubCategoryListFilter), "position")
     search_fields = ("name", "email", "position", "profession")
 
 
@@ -240,7 +254,7 @@ class PublicationsInline(admin.TabularInline):
         if obj.publication_image:
             return format_html(
                 '<img src="{}" style="max-height: 60px; border-radius: 4px; object-fit: cover;">',
-                obj.publication_image.url,
+                resized_url(obj.publication_image, height=120),
             )
         return "No image"
 
@@ -289,7 +303,7 @@ class PublicationsAdmin(admin.ModelAdmin):
         if obj.publication_image:
             return format_html(
                 '<img src="{}" style="max-height: 60px; border-radius: 6px; object-fit: cover;">',
-                obj.publication_image.url,
+                resized_url(obj.publication_image, height=120),
             )
         return format_html('<span style="color: #999;">No image</span>')
 
@@ -299,7 +313,7 @@ class PublicationsAdmin(admin.ModelAdmin):
         if obj.publication_image:
             return format_html(
                 '<img src="{}" style="max-height: 300px; max-width: 100%; border-radius: 8px; border: 1px solid #ddd;">',
-                obj.publication_image.url,
+                resized_url(obj.publication_image, height=600),
             )
         return format_html('<p style="color: #666;">No image uploaded</p>')
 
@@ -349,7 +363,7 @@ class BoardMemberAdmin(admin.ModelAdmin):
         if obj.image and obj.image.url:
             return format_html(
                 '<img src="{}" style="max-height: 60px; border-radius: 6px; object-fit: cover;">',
-                obj.image.url,
+                resized_url(obj.image, height=120),
             )
         return format_html(
             '<span style="color: #999; font-style: italic;">No image</span>'
@@ -361,7 +375,7 @@ class BoardMemberAdmin(admin.ModelAdmin):
         if obj.image and obj.image.url:
             return format_html(
                 '<img src="{}" style="max-height: 300px; max-width: 100%; border-radius: 8px; border: 1px solid #ddd; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">',
-                obj.image.url,
+                resized_url(obj.image, height=600),
             )
         return format_html(
             '<p style="color: #666; font-style: italic;">No photo uploaded yet</p>'
@@ -381,6 +395,7 @@ class ProjectGalleryImageAdmin(admin.ModelAdmin):
         "is_active",
     ]
     list_display_links = ["alt_text_short"]
+    list_select_related = ["related_project"]
     list_filter = [
         "category",
         "is_active",
@@ -423,7 +438,7 @@ class ProjectGalleryImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-height: 60px; border-radius: 4px;">',
-                obj.image.url,
+                resized_url(obj.image, height=120),
             )
         return "-"
 
@@ -433,7 +448,7 @@ class ProjectGalleryImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-height: 300px; max-width: 100%; border: 1px solid #ddd; border-radius: 6px;">',
-                obj.image.url,
+                resized_url(obj.image, height=600),
             )
         return "No image uploaded yet"
 
@@ -457,7 +472,7 @@ class NewsImageInline(admin.TabularInline):
         if obj.image:
             return format_html(
                 '<img src="{url}" style="max-height: 100px; border-radius: 4px;" />',
-                url=obj.image.url,
+                url=resized_url(obj.image, height=200),
             )
         return "-"
 
@@ -478,10 +493,14 @@ class CategoryAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("created_at",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(num_articles=Count("articles"))
+
     def article_count(self, obj):
-        return obj.articles.count()
+        return obj.num_articles
 
     article_count.short_description = "Articles"
+    article_count.admin_order_field = "num_articles"
 
 
 @admin.register(NewsArticle)
@@ -495,6 +514,7 @@ class NewsArticleAdmin(admin.ModelAdmin):
         "is_featured",
         "views_count",
     )
+    list_select_related = ("category", "author")
     list_filter = (
         "is_published",
         "is_featured",
@@ -583,6 +603,7 @@ class NewsArticleAdmin(admin.ModelAdmin):
 @admin.register(NewsImage)
 class NewsImageAdmin(admin.ModelAdmin):
     list_display = ("article_title", "preview", "caption", "order")
+    list_select_related = ("article",)
     list_filter = ("article__category",)
     search_fields = ("article__title", "caption")
     readonly_fields = ("preview",)
@@ -596,7 +617,7 @@ class NewsImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{url}" style="max-height: 80px; border-radius: 4px;" />',
-                url=obj.image.url,
+                url=resized_url(obj.image, height=160),
             )
         return "-"
 
@@ -613,7 +634,7 @@ class ExternalAuthorAdmin(admin.ModelAdmin):
         if obj.photo:
             return format_html(
                 '<img src="{url}" style="max-height: 60px; border-radius: 50%;" />',
-                url=obj.photo.url,
+                url=resized_url(obj.photo, height=120),
             )
         return "-"
 
@@ -712,7 +733,7 @@ class Alumni(admin.ModelAdmin):
         if obj.image and obj.image.url:
             return format_html(
                 '<img src="{}" style="max-height: 60px; border-radius: 6px; object-fit: cover;">',
-                obj.image.url,
+                resized_url(obj.image, height=120),
             )
         return format_html(
             '<span style="color: #999; font-style: italic;">No image</span>'
@@ -724,10 +745,48 @@ class Alumni(admin.ModelAdmin):
         if obj.image and obj.image.url:
             return format_html(
                 '<img src="{}" style="max-height: 300px; max-width: 100%; border-radius: 8px; border: 1px solid #ddd; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">',
-                obj.image.url,
+                resized_url(obj.image, height=600),
             )
         return format_html(
             '<p style="color: #666; font-style: italic;">No photo uploaded yet</p>'
         )
 
     thumbnail_large.short_description = "Photo Preview"
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "model_label",
+        "object_id",
+        "field_name",
+        "kind",
+        "status",
+        "attempts",
+        "run_after",
+        "updated_at",
+    )
+    list_filter = ("status", "kind", "model_label")
+    search_fields = ("model_label", "field_name", "last_error")
+    readonly_fields = (
+        "kind",
+        "model_label",
+        "object_id",
+        "field_name",
+        "status",
+        "attempts",
+        "last_error",
+        "run_after",
+        "created_at",
+        "updated_at",
+    )
+    list_per_page = 50
+
+    actions = ["retry_jobs"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        queryset.update(status=ImageJob.PENDING, attempts=0, run_after=timezone.now())
@@ -0,0 +1,420 @@
+"""
+Whole-response caching for the public views, plus conditional GET.
+
+A view opts in with CachedViewMixin and declares the models its page is
+built from:
+
+    class ProjectView(CachedViewMixin, View):
+        cache_depends_on = [Project, ProjectCategory]
+
+Every model has a version stamp in the cache. Saving or deleting a row of
+a model some cached view or queryset depends on bumps its model's stamp
+(see frontend/signals.py), and a view's cache key
+contains the stamps of the models it depends on, so a page is rebuilt
+exactly when one of them changed and never served stale. Views with no
+dependencies stay cached until VIEW_CACHE_TIMEOUT.
+
+The same declaration drives the CDN: cacheable pages get a public
+Cache-Control from settings.EDGE_CACHE_POLICY and Surrogate-Key / Cache-Tag
+headers naming what they show, which frontend/purge.py purges on save.
+"""
+
+import hashlib
+import time
+from contextlib import nullcontext
+from datetime import UTC, datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+from django.db.models import Count, Max
+from django.db.models.functions import Greatest
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+def view_cache():
+    return caches[settings.VIEW_CACHE_ALIAS]
+
+
+def version_key(model):
+    return f"model-version:{model._meta.label_lower}"
+
+
+def bump_version(model):
+    """Invalidate every cached page that depends on `model`."""
+    view_cache().set(version_key(model), time.time_ns(), None)
+
+
+def single_flight(key):
+    """
+    Hold while rebuilding `key`, so that of all the workers missing it at
+    once only one renders the page (TieredCache); a no-op on other backends.
+    """
+    lock = getattr(view_cache(), "single_flight", None)
+    return lock(key) if lock is not None else nullcontext()
+
+
+def model_versions(models):
+    """Current version stamp of each model, creating missing ones."""
+    cache = view_cache()
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # A fresh stamp, never an old one: entries cached under a stamp
+            # that has since been evicted can't match again.
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    return [str(versions[key]) for key in keys]
+
+
+# ==============================
+# SURROGATE KEYS
+# ==============================
+def model_key(model):
+    """Tags pages listing `model`; purged by any save of it."""
+    return model._meta.label_lower
+
+
+def instance_key(model, pk):
+    """Tags the page of one row; purged when it or its parts change."""
+    return f"{model._meta.label_lower}:{pk}"
+
+
+def covers(model, related):
+    """
+    True if saving a `related` row purges `model` instance keys: `related`
+    has a foreign key to it (a project's images) or they share an m2m.
+    """
+    return any(
+        field.related_model is model
+        for field in related._meta.get_fields()
+        if field.many_to_one or field.many_to_many
+    )
+
+
+def purge_keys(instance):
+    """
+    Keys to purge when `instance` is saved or deleted: its own, its model's,
+    and those of the rows whose pages show it (see touch_related_pages).
+    """
+    model = type(instance)
+    keys = {model_key(model), instance_key(model, instance.pk)}
+
+    for field in model._meta.concrete_fields:
+        if field.many_to_one:
+            pk = getattr(instance, field.attname)
+            if pk is not None:
+                keys.add(instance_key(field.related_model, pk))
+
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            owners = relation.related_model._base_manager.filter(
+                **{relation.field.name: instance}
+            )
+            for pk in owners.values_list("pk", flat=True):
+                keys.add(instance_key(relation.related_model, pk))
+
+    return keys
+
+
+# Every model some cached view depends on
+cached_models = set()
+# Labels ("frontend.staff") of the models CachedManager results are keyed on
+cached_queryset_labels = set()
+
+
+def is_versioned(model):
+    """True if some cached view or queryset is keyed on `model`'s stamp."""
+    return model in cached_models or model._meta.label_lower in cached_queryset_labels
+
+
+class CachedViewMixin:
+    # Models whose rows appear on the page
+    cache_depends_on = ()
+    # Seconds; None uses settings.VIEW_CACHE_TIMEOUT
+    cache_timeout = None
+    # Overrides for settings.EDGE_CACHE_POLICY, e.g. {"s_maxage": 60}
+    edge_cache_policy = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cached_models.update(cls.cache_depends_on)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        if not settings.VIEW_CACHE_ENABLED:
+            return self.render_response(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        cached = view_cache().get(key)
+        if cached is not None:
+            return self.response_from_cache(cached)
+
+        with single_flight(key):
+            # Another worker may have rendered it while we waited
+            cached = view_cache().get(key)
+            if cached is not None:
+                return self.response_from_cache(cached)
+
+            response = self.render_response(request, *args, **kwargs)
+            if self.is_cacheable(request, response):
+                view_cache().set(
+                    key, self.cache_entry(response), self.get_cache_timeout()
+                )
+        response["X-View-Cache"] = "miss"
+        return response
+
+    def render_response(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if isinstance(response, SimpleTemplateResponse):
+            response.render()
+        if self.is_cacheable(request, response):
+            self.add_edge_headers(response)
+        return response
+
+    def get_cache_key(self, request):
+        view = f"{type(self).__module__}.{type(self).__qualname__}"
+        versions = ".".join(model_versions(self.cache_depends_on))
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return f"view:{view}:{versions}:{path}"
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is not None:
+            return self.cache_timeout
+        return settings.VIEW_CACHE_TIMEOUT
+
+    def is_cacheable(self, request, response):
+        """
+        Only plain 200 pages that are the same for every visitor: nothing
+        that set a cookie, used a CSRF token or touched the session.
+        """
+        session = getattr(request, "session", None)
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+            and not (session is not None and session.accessed)
+        )
+
+    def get_edge_cache_policy(self):
+        return {**settings.EDGE_CACHE_POLICY, **self.edge_cache_policy}
+
+    def get_surrogate_keys(self):
+        """
+        A detail page is tagged with its row; every other model it depends
+        on is tagged by model, unless saving one already purges the row.
+        """
+        obj = getattr(self, "object", None)
+        if not isinstance(obj, models.Model):
+            return [model_key(model) for model in self.cache_depends_on]
+
+        main = type(obj)
+        keys = [instance_key(main, obj.pk)]
+        for model in self.cache_depends_on:
+            if model is not main and not covers(main, model):
+                keys.append(model_key(model))
+        return keys
+
+    def add_edge_headers(self, response):
+        patch_cache_control(response, public=True, **self.get_edge_cache_policy())
+        keys = self.get_surrogate_keys()
+        if keys:
+            response["Surrogate-Key"] = " ".join(keys)
+            response["Cache-Tag"] = ",".join(keys)
+
+    def cache_entry(self, response):
+        return {
+            "content": response.content,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+        }
+
+    def response_from_cache(self, entry):
+        response = HttpResponse(entry["content"], status=entry["status"])
+        for header, value in entry["headers"].items():
+            response[header] = value
+        # Reported by warm_cache; CDN logs can tell origin hits apart too
+        response["X-View-Cache"] = "hit"
+        return response
+
+
+# ==============================
+# CONDITIONAL GET
+# ==============================
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before the view (or
+    the page cache) runs. The validators come from one aggregate over the
+    indexed updated_at column of `modified_model`:
+
+        class PublicationsView(ConditionalGetMixin, CachedViewMixin, View):
+            modified_model = Publications
+
+    Detail views are narrowed to their row by the pk/slug URL kwarg; override
+    get_modified_queryset() for anything else. The row count is part of the
+    ETag, so deleting a row (which moves no timestamp) still changes it.
+
+    The page also shows rows of the other cache_depends_on models, and
+    editing most of them (a project's category, a contractor role) moves no
+    updated_at. Their version stamps go into the ETag and date Last-Modified.
+    """
+
+    modified_model = None
+    # Timestamps that date a row; the newest of them wins
+    modified_fields = ("updated_at",)
+
+    def get_modified_queryset(self):
+        queryset = self.modified_model._default_manager.all()
+        if "pk" in self.kwargs:
+            return queryset.filter(pk=self.kwargs["pk"])
+        if "slug" in self.kwargs:
+            return queryset.filter(slug=self.kwargs["slug"])
+        return queryset
+
+    def get_dependency_versions(self):
+        """
+        Stamps of the models in cache_depends_on whose saves don't already
+        touch the main row (see signals.touch_related_pages): those with no
+        foreign key or m2m to it.
+        """
+        main = self.modified_model
+        return model_versions(
+            [
+                model
+                for model in getattr(self, "cache_depends_on", ())
+                if model is not main and not covers(main, model)
+            ]
+        )
+
+    def get_validators(self):
+        if not hasattr(self, "_validators"):
+            latest = [Max(field) for field in self.modified_fields]
+            validators = self.get_modified_queryset().aggregate(
+                last_modified=Greatest(*latest) if len(latest) > 1 else latest[0],
+                count=Count("pk", distinct=True),
+            )
+            validators["versions"] = self.get_dependency_versions()
+            if validators["versions"] and validators["last_modified"] is not None:
+                # Stamps are time.time_ns() of the last save
+                stamp = max(int(version) for version in validators["versions"])
+                validators["last_modified"] = max(
+                    validators["last_modified"],
+                    datetime.fromtimestamp(stamp / 1e9, tz=UTC),
+                )
+            self._validators = validators
+        return self._validators
+
+    def last_modified(self, request, *args, **kwargs):
+        return self.get_validators()["last_modified"]
+
+    def etag(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators["last_modified"] is None:
+            return None
+        # The cache version is bumped on template deploys, which change
+        # the page without touching any row.
+        value = "|".join(
+            str(part)
+            for part in (
+                request.get_full_path(),
+                validators["last_modified"].isoformat(),
+                validators["count"],
+                *validators["versions"],
+                settings.CACHES[settings.VIEW_CACHE_ALIAS].get("VERSION", 1),
+            )
+        )
+        return hashlib.md5(value.encode()).hexdigest()
+
+    def dispatch(self, request, *args, **kwargs):
+        view = condition(etag_func=self.etag, last_modified_func=self.last_modified)
+        return view(super().dispatch)(request, *args, **kwargs)
+
+
+# ==============================
+# QUERYSET CACHE
+# ==============================
+class CachedQuerySet(models.QuerySet):
+    """
+    Results (prefetches included) are kept in the view cache under a key
+    made of the query and the version stamps of the model and the models
+    its manager depends on. Any save or delete of one of those bumps its
+    stamp, so an entry is never read again once stale and nothing needs
+    deleting. Declared on a model next to its normal manager:
+
+        objects = models.Manager()
+        cached = CachedManager(depends_on=["frontend.SubCategory"])
+
+        MainCategory.cached.prefetch_related("sub_categories")
+    """
+
+    depends_on = ()
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.depends_on = self.depends_on
+        return clone
+
+    def cache_key(self):
+        """None for queries that can't be keyed (e.g. always empty)."""
+        try:
+            sql, params = self.query.get_compiler(self.db).as_sql()
+        except EmptyResultSet:
+            return None
+
+        shape = (
+            sql,
+            params,
+            self._iterable_class.__name__,
+            self._fields,
+            [
+                getattr(lookup, "prefetch_to", lookup)
+                for lookup in self._prefetch_related_lookups
+            ],
+        )
+        digest = hashlib.md5(repr(shape).encode()).hexdigest()
+
+        depends = [self.model, *(apps.get_model(label) for label in self.depends_on)]
+        versions = ".".join(model_versions(depends))
+        return f"queryset:{self.model._meta.label_lower}:{versions}:{digest}"
+
+    def _fetch_all(self):
+        if self._result_cache is None:
+            key = self.cache_key()
+            cached = view_cache().get(key) if key is not None else None
+            if cached is not None:
+                self._result_cache = cached
+                self._prefetch_done = True
+            else:
+                super()._fetch_all()
+                if key is not None:
+                    view_cache().set(
+                        key, self._result_cache, settings.VIEW_CACHE_TIMEOUT
+                    )
+        super()._fetch_all()
+
+
+class CachedManager(models.Manager.from_queryset(CachedQuerySet)):
+    def __init__(self, depends_on=()):
+        super().__init__()
+        # App labels ("frontend.Staff") of models shown with the results
+        self.depends_on = tuple(depends_on)
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        cached_queryset_labels.add(cls._meta.label_lower)
+        cached_queryset_labels.update(label.lower() for label in self.depends_on)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        queryset.depends_on = self.depends_on
+        return queryset
@@ -0,0 +1,269 @@
+"""
+A two-tier cache backend: a small in-process LRU in front of a shared cache.
+
+    CACHES = {
+        "shared": {"BACKEND": "django.core.cache.backends.redis.RedisCache", ...},
+        "views": {
+            "BACKEND": "frontend.cache_backend.TieredCache",
+            "OPTIONS": {
+                "SHARED": "shared",
+                "MAX_ENTRIES": 500,
+                "MAX_BYTES": 32 * 1024 * 1024,
+                "LOCAL_TIMEOUT": 300,
+                "BYPASS_PREFIXES": ["model-version:"],
+            },
+        },
+    }
+
+Reads are answered from process memory when possible and fall through to
+the shared cache otherwise; writes go to both. A worker never sees another
+worker's writes to a key it already holds, so the local tier is only
+coherent for keys whose value never changes. The page cache is built that
+way: its keys contain the model version stamps (frontend/cache.py), and the
+stamps themselves are listed in BYPASS_PREFIXES, so they are always read
+from the shared cache. LOCAL_TIMEOUT bounds how long anything else can lag.
+
+single_flight() guards recomputing a missing key: one caller across all
+threads and worker processes does the work, the others wait and then read
+its result.
+"""
+
+import pickle
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = options["SHARED"]
+        self.max_entries = options.get("MAX_ENTRIES", 500)
+        self.max_bytes = options.get("MAX_BYTES", 32 * 1024 * 1024)
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 300)
+        self.bypass_prefixes = tuple(options.get("BYPASS_PREFIXES", ()))
+        self.lock_timeout = options.get("LOCK_TIMEOUT", 10)
+        self.lock_poll = options.get("LOCK_POLL", 0.05)
+
+        # key -> (pickled value, expires at); oldest use first
+        self._local = OrderedDict()
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = weakref.WeakValueDictionary()
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def _version(self, version):
+        return self.version if version is None else version
+
+    def _is_local(self, key):
+        return not key.startswith(self.bypass_prefixes)
+
+    # -----------------------------
+    # LOCAL TIER
+    # -----------------------------
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            pickled, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                self._local_drop(key)
+                return None
+            self._local.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def _local_set(self, key, value, timeout):
+        if timeout is not None and timeout <= 0:
+            self._local_delete(key)
+            return
+
+        if self.local_timeout is not None:
+            timeout = min(t for t in (timeout, self.local_timeout) if t is not None)
+        expires = None if timeout is None else time.monotonic() + timeout
+
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(pickled) > self.max_bytes:
+            self._local_delete(key)
+            return
+
+        with self._lock:
+            self._local_drop(key)
+            self._local[key] = (pickled, expires)
+            self._local_bytes += len(pickled)
+            while (
+                len(self._local) > self.max_entries
+                or self._local_bytes > self.max_bytes
+            ):
+                self._local_drop(next(iter(self._local)))
+
+    def _local_delete(self, key):
+        with self._lock:
+            self._local_drop(key)
+
+    def _local_drop(self, key):
+        # Caller holds self._lock
+        entry = self._local.pop(key, None)
+        if entry is not None:
+            self._local_bytes -= len(entry[0])
+
+    # -----------------------------
+    # CACHE API
+    # -----------------------------
+    def get(self, key, default=None, version=None):
+        version = self._version(version)
+        local_key = self.make_and_validate_key(key, version)
+
+        if self._is_local(key):
+            value = self._local_get(local_key)
+            if value is not None:
+                return value
+
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version=version)
+        if value is sentinel:
+            return default
+        if self._is_local(key):
+            self._local_set(local_key, value, self.local_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        version = self._version(version)
+        found = {}
+        missing = []
+        for key in keys:
+            value = None
+            if self._is_local(key):
+                value = self._local_get(self.make_and_validate_key(key, version))
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing:
+            fetched = self.shared.get_many(missing, version=version)
+            for key, value in fetched.items():
+                if self._is_local(key):
+                    local_key = self.make_and_validate_key(key, version)
+                    self._local_set(local_key, value, self.local_timeout)
+            found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        version = self._version(version)
+        timeout = self._timeout(timeout)
+        self.shared.set(key, value, timeout, version=version)
+        if self._is_local(key):
+            self._local_set(self.make_and_validate_key(key, version), value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        for key, value in data.items():
+            self.set(key, value, timeout, version)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        version = self._version(version)
+        timeout = self._timeout(timeout)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added and self._is_local(key):
+            self._local_set(self.make_and_validate_key(key, version), value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        version = self._version(version)
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.touch(key, self._timeout(timeout), version)
+
+    def delete(self, key, version=None):
+        version = self._version(version)
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.delete(key, version)
+
+    def has_key(self, key, version=None):
+        version = self._version(version)
+        if self._is_local(key):
+            if self._local_get(self.make_and_validate_key(key, version)) is not None:
+                return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        version = self._version(version)
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+        self.shared.clear()
+
+    def clear_local(self):
+        """Forget this process's copies only."""
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+
+    def _timeout(self, timeout=DEFAULT_TIMEOUT):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return timeout
+
+    # -----------------------------
+    # SINGLE-FLIGHT
+    # -----------------------------
+    @contextmanager
+    def single_flight(self, key, version=None):
+        """
+        Wrap the recomputation of a missing `key`:
+
+            with cache.single_flight(key):
+                value = cache.get(key)
+                if value is None:
+                    value = compute()
+                    cache.set(key, value)
+
+        Threads of this process queue on a lock; worker processes race for
+        a lock entry in the shared cache and the losers wait until the value
+        appears (or LOCK_TIMEOUT passes, when they go ahead themselves).
+        """
+        version = self._version(version)
+        lock_key = f"single-flight:{key}"
+        token = uuid.uuid4().hex
+
+        with self._lock:
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = self._key_locks[key] = threading.Lock()
+
+        with key_lock:
+            deadline = time.monotonic() + self.lock_timeout
+            acquired = False
+            while True:
+                acquired = self.shared.add(
+                    lock_key, token, self.lock_timeout, version=version
+                )
+                if acquired or time.monotonic() >= deadline:
+                    break
+                if self.shared.has_key(key, version=version):
+                    break
+                time.sleep(self.lock_poll)
+
+            try:
+                yield
+            finally:
+                if acquired and self.shared.get(lock_key, version=version) == token:
+                    self.shared.delete(lock_key, version=version)
@@ -0,0 +1,412 @@
+"""
+Static HTML export of the public site.
+
+Each exported URL is rendered through the normal Django stack (test
+client, so middleware and templates behave exactly as in production) and
+written to SITE_EXPORT_ROOT/<path>/index.html, for a CDN or static host
+to serve without booting Django. The Vercel deploy does not run the
+export yet, so vercel.json still sends every page to Django.
+
+`python manage.py export_site` writes every page. After that, saving a row
+marks only the pages that show it as stale (pages_for() below, called from
+frontend/signals.py) and `python manage.py regenerate_pages` re-renders
+them once the edits have settled for SITE_EXPORT_DEBOUNCE seconds.
+"""
+
+import os
+import re
+import tempfile
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.test import Client
+from django.urls import Resolver404, resolve, reverse
+from django.utils import timezone
+from django.utils.text import slugify
+
+from frontend.models import (
+    Alumni,
+    BoardMember,
+    Category,
+    ContractorRole,
+    MainCategory,
+    NewsArticle,
+    NewsImage,
+    People,
+    Project,
+    ProjectAward,
+    ProjectCategory,
+    ProjectContractor,
+    ProjectGalleryImage,
+    ProjectImage,
+    ProjectLeader,
+    ProjectTeamMember,
+    Publications,
+    StalePage,
+    Staff,
+    SubCategory,
+)
+from frontend.views import NewsListView, published_articles
+
+# URL names that are never exported (or budgeted in frontend/tests.py):
+# file downloads and signed image variants. "categories" is routed without
+# the slug CategoryNewsListView looks up, so it can only 404; it stays out
+# until the route takes one.
+EXCLUDED_URL_NAMES = {"download_publication", "resized_image", "categories"}
+
+HREF = re.compile(r'href="(/[^"#?]*)"')
+
+
+def seed_urls():
+    """Every page we know exists without crawling: fixed routes plus one URL
+    per detail row, publication type and news page."""
+    from frontend import urls
+
+    found = [
+        f"/{pattern.pattern}"
+        for pattern in urls.urlpatterns
+        if not pattern.pattern.converters
+        and pattern.name not in EXCLUDED_URL_NAMES
+    ]
+
+    for slug in Project.objects.exclude(slug="").values_list("slug", flat=True):
+        found.append(reverse("project_detail", args=[slug]))
+    for pk in Staff.objects.values_list("pk", flat=True):
+        found.append(reverse("staff_detail", args=[pk]))
+    for pk in Alumni.objects.values_list("pk", flat=True):
+        found.append(reverse("alumni_detail", args=[pk]))
+    for pk in BoardMember.objects.values_list("pk", flat=True):
+        found.append(reverse("board_member", args=[pk]))
+    types = Publications.objects.order_by().values_list("type", flat=True)
+    for pub_type in sorted({slugify(pub_type) for pub_type in types} - {""}):
+        found.append(reverse("publications_by_type", args=[pub_type]))
+
+    articles = published_articles()
+    for pk in articles.values_list("pk", flat=True):
+        found.append(reverse("news_detail", args=[pk]))
+    pages = (articles.count() - 1) // NewsListView.paginate_by + 1
+    for page in range(2, pages + 1):
+        found.append(reverse("news_page", args=[page]))
+
+    return list(dict.fromkeys(found))
+
+
+def is_exportable(path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return False
+    return match.url_name not in EXCLUDED_URL_NAMES and not path.startswith(
+        (settings.STATIC_URL, settings.MEDIA_URL)
+    )
+
+
+def output_path(root, url):
+    """/projects/ -> <root>/projects/index.html"""
+    return os.path.join(root, urlsplit(url).path.strip("/"), "index.html")
+
+
+def render_page(url):
+    """
+    Render one URL. Returns (url, status, html or None, internal links).
+    Runs in worker processes, so it only touches the database and templates.
+    """
+    client = Client(HTTP_HOST=settings.SITE_EXPORT_HOST)
+    response = client.get(url, secure=True)
+
+    if response.status_code != 200 or "html" not in response.get("Content-Type", ""):
+        return url, response.status_code, None, []
+
+    html = response.content.decode(response.charset or "utf-8")
+    links = sorted(set(HREF.findall(html)))
+    return url, 200, html, links
+
+
+def write_page(root, url, html):
+    path = output_path(root, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "w", encoding="utf-8") as fp:
+        fp.write(html)
+    os.replace(tmp, path)
+    return path
+
+
+def remove_page(root, url):
+    path = output_path(root, url)
+    if os.path.exists(path):
+        os.remove(path)
+        return True
+    return False
+
+
+def exported_urls(root, *url_names):
+    """URLs with a page under `root`, optionally only those of `url_names`."""
+    found = []
+    for directory, _, files in os.walk(root):
+        if "index.html" not in files:
+            continue
+        path = os.path.relpath(directory, root).replace(os.sep, "/")
+        url = "/" if path == "." else f"/{path}/"
+        try:
+            match = resolve(url)
+        except Resolver404:
+            continue
+        if not url_names or match.url_name in url_names:
+            found.append(url)
+    return found
+
+
+# ==============================
+# DEPENDENCY GRAPH
+# ==============================
+# Model -> function(instance) returning the URLs of the pages that show
+# that row. Models without an entry fall back to every converter-free page
+# whose view lists the model in cache_depends_on.
+PAGE_DEPENDENCIES = {}
+
+# ProjectGalleryImage.category -> gallery page
+GALLERY_PAGES = {
+    ProjectGalleryImage.CIVIC: "civic_culture",
+    ProjectGalleryImage.EDUCATION: "education",
+    ProjectGalleryImage.HEALTH: "health",
+    ProjectGalleryImage.OFFICE: "office_retail",
+    ProjectGalleryImage.RESIDENTIAL: "residential",
+    ProjectGalleryImage.INDUSTRIAL: "industrial_infrastructure",
+    ProjectGalleryImage.HOSPITALITY: "hospitality",
+    ProjectGalleryImage.SPORTS: "sport_leisure",
+    ProjectGalleryImage.LAND: "landscape_planning",
+}
+
+
+def shows(*models):
+    def register(func):
+        for model in models:
+            PAGE_DEPENDENCIES[model] = func
+        return func
+
+    return register
+
+
+def pages_for(instance):
+    rule = PAGE_DEPENDENCIES.get(type(instance))
+    if rule is not None:
+        return list(dict.fromkeys(rule(instance)))
+    return listing_pages(type(instance))
+
+
+def listing_pages(model):
+    from frontend import urls
+
+    return [
+        f"/{pattern.pattern}"
+        for pattern in urls.urlpatterns
+        if not pattern.pattern.converters
+        and pattern.name not in EXCLUDED_URL_NAMES
+        and model in getattr(pattern.callback.view_class, "cache_depends_on", ())
+    ]
+
+
+def gallery_pages(categories):
+    names = {GALLERY_PAGES.get(category) for category in categories}
+    return [reverse(name) for name in sorted(names - {None})]
+
+
+def project_detail_pages(projects):
+    return [
+        reverse("project_detail", args=[slug])
+        for slug in projects.exclude(slug="").values_list("slug", flat=True)
+    ]
+
+
+@shows(Project)
+def project_pages(project):
+    pages = [reverse("projects"), reverse("project_list")]
+    if project.slug:
+        pages.append(reverse("project_detail", args=[project.slug]))
+    # Gallery pages link their images to the project
+    if project.pk:
+        categories = project.featured_gallery_images.values_list("category", flat=True)
+        pages += gallery_pages(categories)
+    return pages
+
+
+@shows(ProjectImage, ProjectAward, ProjectContractor)
+def project_part_pages(part):
+    return project_detail_pages(Project.objects.filter(pk=part.project_id))
+
+
+@shows(ProjectLeader, ProjectTeamMember)
+def project_member_pages(member):
+    return project_detail_pages(member.projects.all())
+
+
+@shows(ContractorRole)
+def contractor_role_pages(role):
+    return project_detail_pages(Project.objects.filter(contractors__role=role))
+
+
+@shows(ProjectCategory)
+def project_category_pages(category):
+    return [
+        reverse("projects"),
+        reverse("project_list"),
+        *project_detail_pages(category.projects.all()),
+    ]
+
+
+@shows(ProjectGalleryImage)
+def gallery_image_pages(image):
+    return gallery_pages([image.category])
+
+
+@shows(Staff)
+def staff_pages(staff):
+    return [reverse("management"), reverse("staff_detail", args=[staff.pk])]
+
+
+@shows(MainCategory, SubCategory)
+def staff_category_pages(category):
+    if isinstance(category, MainCategory):
+        staff = Staff.objects.filter(sub_category__main_category=category)
+    else:
+        staff = Staff.objects.filter(sub_category=category)
+    pks = staff.values_list("pk", flat=True)
+    return [reverse("management"), *(reverse("staff_detail", args=[pk]) for pk in pks)]
+
+
+@shows(BoardMember)
+def board_member_pages(member):
+    return [
+        reverse("corporate_governance"),
+        reverse("board_member", args=[member.pk]),
+    ]
+
+
+@shows(Alumni)
+def alumni_pages(alumni):
+    return [reverse("board_chairman"), reverse("alumni_detail", args=[alumni.pk])]
+
+
+@shows(People)
+def people_pages(person):
+    return listing_pages(People)
+
+
+@shows(Publications)
+def publication_pages(publication):
+    # Type pages are only reachable through links, so take the exported ones
+    return [
+        reverse("publications"),
+        *exported_urls(settings.SITE_EXPORT_ROOT, "publications_by_type"),
+    ]
+
+
+def news_list_pages():
+    # Every list page: one article going live shifts all the others. Pages
+    # past the new end are re-rendered too, 404, and are removed.
+    pages = (published_articles().count() - 1) // NewsListView.paginate_by + 1
+    return [
+        reverse("news_list"),
+        *(reverse("news_page", args=[page]) for page in range(2, pages + 1)),
+        *exported_urls(settings.SITE_EXPORT_ROOT, "news_page"),
+    ]
+
+
+@shows(NewsArticle)
+def article_pages(article):
+    # The article, and the articles listing it under "related"
+    related = published_articles().filter(category_id=article.category_id)
+    if article.category_id is None:
+        related = related.none()
+    return [
+        *news_list_pages(),
+        reverse("news_detail", args=[article.pk]),
+        *(
+            reverse("news_detail", args=[pk])
+            for pk in related.values_list("pk", flat=True)
+        ),
+    ]
+
+
+@shows(NewsImage)
+def article_image_pages(image):
+    return [reverse("news_detail", args=[image.article_id])]
+
+
+@shows(Category)
+def news_category_pages(category):
+    # The category list is in the sidebar of every news page
+    return [
+        *news_list_pages(),
+        *(
+            reverse("news_detail", args=[pk])
+            for pk in published_articles().values_list("pk", flat=True)
+        ),
+    ]
+
+
+# ==============================
+# INCREMENTAL REGENERATION
+# ==============================
+def mark_stale(urls):
+    """
+    Queue `urls` for regenerate_pages. A page already queued has its due
+    time pushed back, so a burst of saves renders it once.
+    """
+    urls = set(urls)
+    if not urls:
+        return
+
+    due_at = timezone.now() + timedelta(seconds=settings.SITE_EXPORT_DEBOUNCE)
+    queued = StalePage.objects.filter(url__in=urls)
+    queued.update(due_at=due_at, marked_at=timezone.now())
+    missing = urls - set(queued.values_list("url", flat=True))
+    StalePage.objects.bulk_create(
+        [StalePage(url=url, due_at=due_at) for url in sorted(missing)],
+        ignore_conflicts=True,
+    )
+
+
+def newly_published(since):
+    """Pages of scheduled articles that went live after `since`; no save
+    announces those."""
+    urls = set()
+    for article in published_articles().filter(publish_date__gt=since):
+        urls.update(pages_for(article))
+    return urls
+
+
+def claim(limit=100):
+    """
+    Take up to `limit` due pages off the queue. Each row is claimed by
+    deleting it, so concurrent workers never render the same page, and an
+    edit made while a page renders queues it again.
+    """
+    claimed = []
+    for page in StalePage.objects.filter(due_at__lte=timezone.now())[:limit]:
+        deleted, _ = StalePage.objects.filter(pk=page.pk, due_at=page.due_at).delete()
+        if deleted:
+            claimed.append(page.url)
+    return claimed
+
+
+def regenerate(root, url):
+    """
+    Re-render one exported page. Returns its status; a page that no longer
+    exists is removed. Links to pages not exported yet are queued.
+    """
+    url, status, html, links = render_page(url)
+
+    if html is not None:
+        write_page(root, url, html)
+        mark_stale(
+            link
+            for link in links
+            if is_exportable(link) and not os.path.exists(output_path(root, link))
+        )
+    elif status in (404, 410):
+        remove_page(root, url)
+    return status
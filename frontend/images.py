@@ -0,0 +1,378 @@
+import base64
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from PIL import Image, features
+
+# ==============================
+# RENDITIONS
+# ==============================
+# Widths (px) written next to every optimized image so templates can
+# offer the browser a srcset instead of the full 1200px file.
+RENDITION_WIDTHS = (320, 640, 960, 1200)
+
+# Modern formats written as siblings of the optimized original, best first.
+# Browsers pick the first <source> they support, so order matters.
+MODERN_FORMATS = ("avif", "webp")
+
+MIME_TYPES = {
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+
+class ImagePolicy:
+    """
+    How one ImageField is processed: the largest size kept, the encode
+    quality, the modern formats written alongside and the rendition widths.
+    Models declare these per field in IMAGE_POLICIES.
+    """
+
+    def __init__(
+        self,
+        max_size=(1200, 1200),
+        quality=85,
+        formats=MODERN_FORMATS,
+        widths=RENDITION_WIDTHS,
+    ):
+        self.max_size = max_size
+        self.quality = quality
+        self.formats = formats
+        self.widths = widths
+
+
+PIL_FORMATS = {
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".png": "PNG",
+    ".webp": "WEBP",
+}
+
+
+def pil_format(name):
+    return PIL_FORMATS.get(os.path.splitext(name)[1].lower(), "JPEG")
+
+
+class ImageTooLarge(ValueError):
+    pass
+
+
+def fitted_size(size, max_size):
+    """The size `size` becomes after thumbnail(max_size)."""
+    width, height = size
+    ratio = min(max_size[0] / width, max_size[1] / height, 1)
+    return max(1, round(width * ratio)), max(1, round(height * ratio))
+
+
+def open_image(fp, max_size=None, max_pixels=None):
+    """
+    Open an image for the pipeline while decoding as little as possible.
+
+    JPEGs are put in draft mode, so libjpeg scales by 1/2, 1/4 or 1/8 while
+    decoding and a 24MP phone photo never exists in memory at full size.
+    `max_pixels` caps what is actually decoded; anything larger raises
+    ImageTooLarge before pixel data is read.
+    """
+    img = Image.open(fp)
+
+    if max_size and img.format == "JPEG":
+        img.draft("RGB", fitted_size(img.size, max_size))
+
+    if max_pixels and img.width * img.height > max_pixels:
+        raise ImageTooLarge(
+            f"{img.width}x{img.height} exceeds the {max_pixels} pixel budget"
+        )
+
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+
+    return img
+
+
+def validate_pixel_budget(value):
+    """
+    Field validator: reject a new upload open_image() would refuse, so the
+    admin shows a form error instead of save() failing with a 500.
+    """
+    if not value or getattr(value, "_committed", True):
+        return
+
+    model = type(value.instance)
+    max_size = None
+    if hasattr(model, "image_policy"):
+        max_size = model.image_policy(value.field.name).max_size
+
+    try:
+        # Header only: the pixel check runs before anything is decoded
+        img = Image.open(value)
+        if max_size and img.format == "JPEG":
+            img.draft("RGB", fitted_size(img.size, max_size))
+    except OSError:
+        return  # ImageField's own validation reports unreadable files
+    finally:
+        value.seek(0)
+
+    max_pixels = settings.IMAGE_MAX_PIXELS
+    if img.width * img.height > max_pixels:
+        raise ValidationError(
+            "This image is %(width)s×%(height)s pixels, more than the "
+            "%(max_pixels)s pixels allowed. Upload a smaller version.",
+            code="image_too_large",
+            params={
+                "width": img.width,
+                "height": img.height,
+                "max_pixels": max_pixels,
+            },
+        )
+
+
+def encode_image(img, fmt, quality):
+    """Encode a PIL image and return the raw bytes."""
+    buffer = BytesIO()
+
+    if fmt == "JPEG":
+        img.save(buffer, format="JPEG", quality=quality, optimize=True)
+    elif fmt == "PNG":
+        img.save(buffer, format="PNG", optimize=True)
+    else:
+        img.save(buffer, format=fmt, quality=quality)
+
+    return buffer.getvalue()
+
+
+def rendition_name(name, width):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}-{width}w{ext}"
+
+
+def replace_file(storage, name, content):
+    """
+    Save content as `name`, replacing any previous file, and return the
+    stored name (a content-addressed storage picks its own).
+    """
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(content))
+
+
+def save_renditions(img, name, storage, widths=RENDITION_WIDTHS, quality=85):
+    """
+    Write downscaled copies of `img` next to the stored file `name`.
+    Widths larger than the image itself are skipped (no upscaling).
+    Returns {"<width>": "<stored name>"}.
+    """
+    fmt = pil_format(name)
+    saved = {}
+
+    for width in widths:
+        if width >= img.width:
+            continue
+        height = max(1, round(img.height * width / img.width))
+        resized = img.resize((width, height), Image.LANCZOS)
+        saved[str(width)] = replace_file(
+            storage, rendition_name(name, width), encode_image(resized, fmt, quality)
+        )
+
+    return saved
+
+
+def save_format_variants(
+    img, name, storage, formats=MODERN_FORMATS, widths=RENDITION_WIDTHS, quality=85
+):
+    """
+    Write `img` in each modern format (full size plus every rendition width)
+    next to the stored file `name`. Formats Pillow was built without, or the
+    one the original is already stored in, are skipped.
+    Returns {"<format>": {"<width>": "<stored name>"}}.
+    """
+    source_fmt = pil_format(name).lower()
+    saved = {}
+
+    for fmt in formats:
+        if fmt == source_fmt or not features.check(fmt):
+            continue
+
+        names = {}
+        for width in sorted({w for w in widths if w < img.width} | {img.width}):
+            height = max(1, round(img.height * width / img.width))
+            # Keep the source extension (photo.png -> photo.png.webp) so a
+            # .jpg and a .png with the same stem never share a sibling.
+            if width == img.width:
+                resized = img
+                target = f"{name}.{fmt}"
+            else:
+                resized = img.resize((width, height), Image.LANCZOS)
+                target = f"{rendition_name(name, width)}.{fmt}"
+            names[str(width)] = replace_file(
+                storage, target, encode_image(resized, fmt.upper(), quality)
+            )
+        saved[fmt] = names
+
+    return saved
+
+
+def build_renditions(
+    img, name, storage, widths=RENDITION_WIDTHS, formats=MODERN_FORMATS, quality=85
+):
+    """
+    Write every rendition of `img` (stored as `name`) and return the lookup
+    entry kept in a model's `renditions` field.
+    """
+    saved = {
+        pil_format(name).lower(): save_renditions(img, name, storage, widths, quality)
+    }
+    saved.update(save_format_variants(img, name, storage, formats, widths, quality))
+
+    return {
+        "source": name,
+        "width": img.width,
+        "height": img.height,
+        "formats": saved,
+    }
+
+
+def delete_renditions(entry, storage):
+    for names in (entry or {}).get("formats", {}).values():
+        for name in names.values():
+            if storage.exists(name):
+                storage.delete(name)
+
+
+# ==============================
+# METADATA (dimensions + placeholder)
+# ==============================
+# Stored on the row as <field>_width, <field>_height, <field>_color and
+# <field>_placeholder, so templates can reserve space and paint something
+# before the real image arrives without ever opening the file.
+METADATA_KEYS = ("width", "height", "color", "placeholder")
+PLACEHOLDER_SIZE = 16
+
+
+def placeholder_metadata(img):
+    """Dominant colour and a tiny base64 LQIP data URI for `img`."""
+    small = img.convert("RGB")
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BILINEAR)
+
+    red, green, blue = small.resize((1, 1), Image.BOX).getpixel((0, 0))
+
+    fmt = "webp" if features.check("webp") else "jpeg"
+    encoded = base64.b64encode(encode_image(small, fmt.upper(), 40)).decode()
+
+    return {
+        "color": f"#{red:02x}{green:02x}{blue:02x}",
+        "placeholder": f"data:image/{fmt};base64,{encoded}",
+    }
+
+
+def image_metadata(img):
+    """Metadata for an image that is already decoded (the pipeline's copy)."""
+    return {"width": img.width, "height": img.height, **placeholder_metadata(img)}
+
+
+def read_metadata(fp):
+    """
+    Metadata for a stored file. Dimensions come from the header and the
+    placeholder from a draft-mode decode, so this stays cheap for big files.
+    """
+    with Image.open(fp) as img:
+        width, height = img.size
+        if img.format == "JPEG":
+            img.draft("RGB", (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+        return {"width": width, "height": height, **placeholder_metadata(img)}
+
+
+def metadata_fields(model, field_name):
+    """{key: model attribute} for the metadata columns `model` actually has."""
+    names = {field.name for field in model._meta.get_fields()}
+    return {
+        key: f"{field_name}_{key}"
+        for key in METADATA_KEYS
+        if f"{field_name}_{key}" in names
+    }
+
+
+def apply_metadata(instance, field_name, metadata):
+    """Copy `metadata` onto instance; returns the attribute names it set."""
+    fields = metadata_fields(type(instance), field_name)
+    for key, attribute in fields.items():
+        setattr(instance, attribute, metadata[key])
+    return list(fields.values())
+
+
+def stored_metadata(field_file):
+    """The metadata recorded on the row for `field_file`, or None."""
+    if not field_file:
+        return None
+
+    instance = field_file.instance
+    fields = metadata_fields(type(instance), field_file.field.name)
+    if "width" not in fields or not getattr(instance, fields["width"]):
+        return None
+
+    return {key: getattr(instance, attribute) for key, attribute in fields.items()}
+
+
+# ==============================
+# LOOKUP (used by template tags)
+# ==============================
+def rendition_entry(field_file):
+    """
+    Return the renditions recorded for `field_file`, or None when the model
+    has none or they were generated for a different (older) file.
+    """
+    if not field_file:
+        return None
+
+    renditions = getattr(field_file.instance, "renditions", None) or {}
+    entry = renditions.get(field_file.field.name)
+
+    if not entry or entry.get("source") != field_file.name:
+        return None
+    return entry
+
+
+def is_optimized(field_file):
+    """
+    The optimization marker: renditions recorded for the exact file the
+    field currently points at.
+    """
+    return rendition_entry(field_file) is not None
+
+
+def srcset_candidates(field_file, fmt=None):
+    """
+    Return [(url, width), ...] sorted by width for `field_file`.
+    The optimized original is always the largest candidate.
+    """
+    entry = rendition_entry(field_file)
+    if entry is None:
+        return []
+
+    storage = field_file.storage
+    formats = entry.get("formats", {})
+    names = formats.get(fmt or pil_format(field_file.name).lower(), {})
+
+    candidates = [(storage.url(name), int(width)) for width, name in names.items()]
+    if fmt is None and entry.get("width"):
+        candidates.append((field_file.url, entry["width"]))
+
+    return sorted(candidates, key=lambda candidate: candidate[1])
+
+
+def modern_sources(field_file):
+    """Return [(mime type, [(url, width), ...]), ...] in preference order."""
+    entry = rendition_entry(field_file)
+    if entry is None:
+        return []
+
+    formats = entry.get("formats", {})
+    return [
+        (MIME_TYPES[fmt], srcset_candidates(field_file, fmt))
+        for fmt in MODERN_FORMATS
+        if formats.get(fmt)
+    ]
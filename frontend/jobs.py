@@ -0,0 +1,100 @@
+"""
+A small DB-backed queue for image work.
+
+Model saves enqueue jobs (frontend/signals.py) and
+`python manage.py process_image_jobs` drains them, so admin requests never
+run Pillow themselves. No broker is needed: the queue is the ImageJob table.
+"""
+
+import traceback
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import transaction
+from django.utils import timezone
+
+from frontend.models import ImageJob
+
+# Seconds to wait before retry n (doubles each attempt)
+RETRY_BACKOFF = 30
+
+# A RUNNING job not touched for this long is assumed to belong to a
+# crashed worker and is handed out again.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def enqueue(instance, field_name, kind=ImageJob.OPTIMIZE):
+    """Queue `kind` work for instance.<field_name> unless already pending."""
+    job, _ = ImageJob.objects.get_or_create(
+        kind=kind,
+        model_label=instance._meta.label,
+        object_id=instance.pk,
+        field_name=field_name,
+        status=ImageJob.PENDING,
+    )
+    return job
+
+
+def claim(limit=10):
+    """
+    Mark up to `limit` due jobs as RUNNING and return them. Each row is
+    claimed with a conditional UPDATE, so concurrent workers never get
+    the same job.
+    """
+    now = timezone.now()
+    candidates = ImageJob.objects.filter(
+        status=ImageJob.PENDING, run_after__lte=now
+    ) | ImageJob.objects.filter(
+        status=ImageJob.RUNNING, updated_at__lt=now - STALE_AFTER
+    )
+
+    claimed = []
+    for job in candidates.order_by("run_after")[:limit]:
+        updated = ImageJob.objects.filter(
+            pk=job.pk, status=job.status, updated_at=job.updated_at
+        ).update(status=ImageJob.RUNNING, attempts=job.attempts + 1, updated_at=now)
+        if updated:
+            job.refresh_from_db()
+            claimed.append(job)
+    return claimed
+
+
+def process(job):
+    """Run one claimed job and record the outcome on it."""
+    try:
+        with transaction.atomic():
+            run(job)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = ImageJob.FAILED
+        else:
+            job.status = ImageJob.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=RETRY_BACKOFF * 2 ** (job.attempts - 1)
+            )
+    else:
+        job.status = ImageJob.DONE
+        job.last_error = ""
+
+    job.save(update_fields=["status", "last_error", "run_after", "updated_at"])
+    return job
+
+
+def run(job):
+    model = apps.get_model(job.model_label)
+    instance = model.objects.filter(pk=job.object_id).first()
+    if instance is None:
+        return  # row deleted since the job was queued; nothing to do
+
+    image_field = getattr(instance, job.field_name)
+    if not image_field:
+        return
+
+    if job.kind == ImageJob.OPTIMIZE:
+        instance.optimize_image(image_field, force=True)
+    else:
+        instance.record_renditions(image_field, instance.open_image(image_field))
+
+    # Save the (possibly renamed) file, its lookup and metadata only.
+    instance.save(update_fields=instance.image_update_fields(job.field_name))
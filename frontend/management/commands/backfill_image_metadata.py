@@ -0,0 +1,79 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from frontend.cache import bump_version
+from frontend.images import metadata_fields, read_metadata
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in width/height/colour/placeholder columns for images uploaded "
+        "before those columns existed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Recompute rows that already have metadata.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Rows per bulk_update."
+        )
+
+    def handle(self, *args, **options):
+        for model in apps.get_app_config("frontend").get_models():
+            for field in model._meta.get_fields():
+                fields = metadata_fields(model, field.name)
+                if "width" in fields:
+                    self.backfill(model, field.name, fields, options)
+
+    def backfill(self, model, field_name, fields, options):
+        queryset = model.objects.exclude(**{field_name: ""}).exclude(
+            **{f"{field_name}__isnull": True}
+        )
+        if not options["force"]:
+            queryset = queryset.filter(**{f"{fields['width']}__isnull": True})
+
+        columns = list(fields.values())
+        # bulk_update() skips auto_now; date the pages showing these images
+        touch = any(field.name == "updated_at" for field in model._meta.fields)
+        if touch:
+            columns.append("updated_at")
+
+        pending, filled, missing = [], 0, 0
+        for instance in queryset.iterator():
+            image_field = getattr(instance, field_name)
+            try:
+                with image_field.storage.open(image_field.name) as fp:
+                    metadata = read_metadata(fp)
+            except (OSError, ValueError) as exc:
+                missing += 1
+                self.stderr.write(f"Skipped {image_field.name}: {exc}")
+                continue
+
+            for key, attribute in fields.items():
+                setattr(instance, attribute, metadata[key])
+            if touch:
+                instance.updated_at = timezone.now()
+            pending.append(instance)
+
+            if len(pending) >= options["batch_size"]:
+                model.objects.bulk_update(pending, columns)
+                filled += len(pending)
+                pending = []
+
+        if pending:
+            model.objects.bulk_update(pending, columns)
+            filled += len(pending)
+
+        # bulk_update() sends no signals; drop the cached pages ourselves
+        if filled:
+            bump_version(model)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{model.__name__}.{field_name}: filled {filled}, skipped {missing}"
+            )
+        )
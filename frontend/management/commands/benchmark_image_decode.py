@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from frontend.images import encode_image, open_image, pil_format
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+MAX_SIZE = (1200, 1200)
+QUALITY = 85
+
+
+def optimize_before(path):
+    """The optimizer as it was: full decode, then thumbnail()."""
+    img = Image.open(path)
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+    img.load()
+    img.thumbnail(MAX_SIZE, Image.LANCZOS)
+    return encode_image(img, pil_format(path), QUALITY)
+
+
+def optimize_after(path):
+    """The optimizer now: draft-mode decode, then thumbnail()."""
+    img = open_image(path, MAX_SIZE)
+    img.thumbnail(MAX_SIZE, Image.LANCZOS)
+    return encode_image(img, pil_format(path), QUALITY)
+
+
+def peak_rss_kb():
+    # VmHWM belongs to this process image; ru_maxrss can carry the parent's
+    # peak over a fork/exec, so only fall back to it off Linux.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(path, mode):
+    """
+    Runs in a fresh process so the peak only reflects this one file.
+    Returns (peak RSS growth in KB, wall seconds).
+    """
+    Image.init()
+    before = peak_rss_kb()
+    start = time.perf_counter()
+
+    if mode == "before":
+        optimize_before(path)
+    else:
+        optimize_after(path)
+
+    wall = time.perf_counter() - start
+    return peak_rss_kb() - before, wall
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare peak memory and wall time per megapixel of the old and new "
+        "image decode paths on files from MEDIA_ROOT."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Images to benchmark.")
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=5,
+            help="Without paths, use the N largest images under media/ and projects/.",
+        )
+        parser.add_argument(
+            "--synthetic",
+            type=float,
+            default=24,
+            help="Also benchmark a generated JPEG of this many megapixels (0 to skip).",
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or self.largest_images(options["limit"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            if options["synthetic"]:
+                paths.append(self.synthetic_jpeg(tmp, options["synthetic"]))
+            self.report(paths)
+
+    def largest_images(self, limit):
+        found = []
+        for root in (Path(settings.MEDIA_ROOT), Path(settings.BASE_DIR) / "projects"):
+            for path in root.rglob("*"):
+                if path.suffix.lower() in IMAGE_EXTENSIONS:
+                    found.append(path)
+        found.sort(key=lambda path: path.stat().st_size, reverse=True)
+        return [str(path) for path in found[:limit]]
+
+    def synthetic_jpeg(self, tmp, megapixels):
+        width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+        height = int(width * 3 / 4)
+        path = os.path.join(tmp, f"synthetic_{megapixels:g}mp.jpg")
+        Image.effect_noise((width, height), 64).convert("RGB").save(path, quality=90)
+        return path
+
+    def report(self, paths):
+        header = (
+            f"{'file':40} {'MP':>5} {'mode':>6} {'peak MB':>8} "
+            f"{'ms':>8} {'MB/MP':>7} {'ms/MP':>7}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        totals = {"before": [0, 0, 0], "after": [0, 0, 0]}  # MP, KB, seconds
+
+        # One process per measurement: peak RSS never goes down, so
+        # reusing a worker would hide the second run's peak.
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(1, mp_context=context, max_tasks_per_child=1)
+        with pool:
+            for path in paths:
+                with Image.open(path) as img:
+                    megapixels = img.width * img.height / 1_000_000
+
+                for mode in ("before", "after"):
+                    peak_kb, wall = pool.submit(measure, path, mode).result()
+                    totals[mode][0] += megapixels
+                    totals[mode][1] += peak_kb
+                    totals[mode][2] += wall
+                    self.stdout.write(
+                        f"{os.path.basename(path)[:40]:40} {megapixels:5.1f} {mode:>6} "
+                        f"{peak_kb / 1024:8.1f} {wall * 1000:8.1f} "
+                        f"{peak_kb / 1024 / megapixels:7.2f} {wall * 1000 / megapixels:7.1f}"
+                    )
+
+        self.stdout.write("")
+        for mode, (megapixels, peak_kb, wall) in totals.items():
+            if megapixels:
+                self.stdout.write(
+                    f"{mode:>6}: {peak_kb / 1024 / megapixels:.2f} MB/MP, "
+                    f"{wall * 1000 / megapixels:.1f} ms/MP"
+                )
@@ -0,0 +1,248 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.template.base import Template
+from django.test import Client, override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from frontend.export import seed_urls
+
+# Metrics compared against a baseline, with the smallest change that counts
+# (below it, timing noise on a quiet machine is larger than the change).
+COMPARED = {
+    "p50_ms": 1.0,
+    "p95_ms": 2.0,
+    "sql_ms": 1.0,
+    "template_ms": 1.0,
+    "peak_kb": 64,
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[round((len(ordered) - 1) * pct / 100)]
+
+
+@contextmanager
+def timed_queries(totals):
+    """Append (ms) for every query run inside the block to `totals`."""
+
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            totals.append((time.perf_counter() - start) * 1000)
+
+    with connection.execute_wrapper(wrapper):
+        yield
+
+
+@contextmanager
+def timed_templates(totals):
+    """
+    Append (ms) for every top-level template render inside the block to
+    `totals`. Includes and extends render inside their parent and are not
+    counted twice; queries a template triggers count towards it.
+    """
+    render = Template.render
+    depth = 0
+
+    def timed_render(self, context):
+        nonlocal depth
+        if depth:
+            return render(self, context)
+        depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            depth -= 1
+            totals.append((time.perf_counter() - start) * 1000)
+
+    Template.render = timed_render
+    try:
+        yield
+    finally:
+        Template.render = render
+
+
+class Command(BaseCommand):
+    help = (
+        "Render one URL of every route in frontend/urls.py --runs times and "
+        "record latency (p50/p95), queries, SQL time, template time and peak "
+        "allocated memory. Run it against a seeded database (seed_scale). "
+        "With --compare, routes slower than a saved --output by more than "
+        "--threshold are reported and the command fails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "url_names", nargs="*", help="Routes to benchmark (default: all)."
+        )
+        parser.add_argument(
+            "--runs", type=int, default=20, help="Timed requests per route."
+        )
+        parser.add_argument(
+            "--warm",
+            action="store_true",
+            help="Keep the view and fragment caches between runs. By default "
+            "they are cleared before every request, so each run does the "
+            "full work.",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument(
+            "--compare", help="A JSON file from an earlier --output to compare to."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Relative slowdown reported as a regression (default 0.2).",
+        )
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+
+        routes = self.routes(options["url_names"])
+        self.client = Client(HTTP_HOST=settings.SITE_EXPORT_HOST)
+        self.warm = options["warm"]
+
+        results = {}
+        # The page cache would answer before any view code runs
+        with override_settings(VIEW_CACHE_ENABLED=False):
+            for url_name, url in routes.items():
+                results[url_name] = self.measure(url, options["runs"])
+                self.report(url_name, results[url_name])
+
+        data = {
+            "created": timezone.now().isoformat(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "runs": options["runs"],
+            "warm": self.warm,
+            "routes": results,
+        }
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(data, indent=2) + "\n")
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+            if not options["url_names"]:
+                self.report_missing(baseline, data)
+            self.compare(baseline, data, options["threshold"])
+
+    def routes(self, url_names):
+        """{url name: the first URL seed_urls() has for it}."""
+        routes = {}
+        for url in seed_urls():
+            routes.setdefault(resolve(url).url_name, url)
+
+        if url_names:
+            unknown = set(url_names) - set(routes)
+            if unknown:
+                raise CommandError(
+                    f"No URL for {', '.join(sorted(unknown))} (unknown route, "
+                    "or no rows to show: run seed_scale)."
+                )
+            routes = {name: routes[name] for name in url_names}
+        return routes
+
+    def request(self, url):
+        if not self.warm:
+            for alias in (settings.VIEW_CACHE_ALIAS, "fragments"):
+                caches[alias].clear()
+        return self.client.get(url, secure=True)
+
+    def measure(self, url, runs):
+        # One untimed request fills the template loader and the URL resolver
+        status = self.request(url).status_code
+
+        times, queries, sql, templates = [], [], [], []
+        for _ in range(runs):
+            query_times, template_times = [], []
+            with timed_queries(query_times), timed_templates(template_times):
+                start = time.perf_counter()
+                self.request(url)
+                times.append((time.perf_counter() - start) * 1000)
+            queries.append(len(query_times))
+            sql.append(sum(query_times))
+            templates.append(sum(template_times))
+
+        # tracemalloc slows everything down, so memory gets a pass of its own
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            self.request(url)
+            peak = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "url": url,
+            "status": status,
+            "p50_ms": round(percentile(times, 50), 3),
+            "p95_ms": round(percentile(times, 95), 3),
+            "queries": max(queries),
+            "sql_ms": round(percentile(sql, 50), 3),
+            "template_ms": round(percentile(templates, 50), 3),
+            "peak_kb": round(peak / 1024, 1),
+        }
+
+    def report(self, url_name, result):
+        line = (
+            f"{url_name:32} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} ms "
+            f"{result['queries']:4} q {result['sql_ms']:7.2f} sql "
+            f"{result['template_ms']:7.2f} tpl {result['peak_kb']:9.1f} KB"
+        )
+        if result["status"] == 200:
+            self.stdout.write(line)
+        else:
+            self.stdout.write(self.style.WARNING(f"{line}  ({result['status']})"))
+
+    def compare(self, baseline, current, threshold):
+        regressions = []
+        for url_name, result in current["routes"].items():
+            before = baseline["routes"].get(url_name)
+            if before is None:
+                continue
+
+            if result["queries"] > before["queries"]:
+                regressions.append(
+                    f"{url_name}: queries {before['queries']} -> {result['queries']}"
+                )
+            for metric, floor in COMPARED.items():
+                old, new = before[metric], result[metric]
+                if new - old > floor and new > old * (1 + threshold):
+                    regressions.append(
+                        f"{url_name}: {metric} {old} -> {new} "
+                        f"(+{(new - old) / old if old else 1:.0%})"
+                    )
+
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(
+                f"{len(regressions)} regression(s) beyond {threshold:.0%}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"No route regressed beyond {threshold:.0%}.")
+        )
+
+    def report_missing(self, baseline, current):
+        missing = sorted(set(baseline["routes"]) - set(current["routes"]))
+        if missing:
+            self.stdout.write(
+                self.style.WARNING(f"Not in this run: {', '.join(missing)}")
+            )
@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+# url names of frontend/management.html and frontend/projects.html
+PAGES = ("management", "projects")
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the management and projects pages with the template fragment "
+        "cache cold (cleared before every render) and warm."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "url_names", nargs="*", help=f"Pages to time (default: {', '.join(PAGES)})."
+        )
+        parser.add_argument(
+            "--runs", type=int, default=50, help="Renders per page and mode."
+        )
+
+    def handle(self, *args, **options):
+        fragments = caches["fragments"]
+        if type(fragments).__name__ == "DummyCache":
+            self.stderr.write(
+                "The fragments cache is a DummyCache (DEBUG?); set "
+                "FRAGMENT_CACHE_BACKEND to measure it."
+            )
+            return
+
+        header = (
+            f"{'page':14} {'mode':>5} {'median ms':>10} {'p90 ms':>8} "
+            f"{'queries':>8}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        # The page cache would answer before any template renders
+        with override_settings(VIEW_CACHE_ENABLED=False):
+            for url_name in options["url_names"] or PAGES:
+                cold = self.measure(url_name, options["runs"], fragments.clear)
+                warm = self.measure(url_name, options["runs"], lambda: None)
+                for mode, (times, queries) in (("cold", cold), ("warm", warm)):
+                    self.stdout.write(
+                        f"{url_name:14} {mode:>5} {statistics.median(times):10.2f} "
+                        f"{statistics.quantiles(times, n=10)[-1]:8.2f} {queries:8}"
+                    )
+                saved = 1 - statistics.median(warm[0]) / statistics.median(cold[0])
+                self.stdout.write(
+                    self.style.SUCCESS(f"{url_name}: {saved:.0%} faster warm")
+                )
+
+    def measure(self, url_name, runs, before_each):
+        """Render times (ms) over `runs` requests and queries of the last one."""
+        path = reverse(url_name)
+        match = resolve(path)
+        factory = RequestFactory()
+
+        times = []
+        for _ in range(runs + 1):
+            before_each()
+            request = factory.get(path)
+            request.resolver_match = match
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                match.func(request, *match.args, **match.kwargs)
+                times.append((time.perf_counter() - start) * 1000)
+
+        # The first render also fills the template loader cache
+        return times[1:], len(queries)
@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from frontend.export import (
+    is_exportable,
+    output_path,
+    render_page,
+    seed_urls,
+    write_page,
+)
+from frontend.models import StalePage
+
+
+def setup_worker():
+    django.setup()
+    # The parent closed its connections before forking; never reuse one
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every public page to <output>/<path>/index.html so the CDN can "
+        "serve it without Django. Pages linked from rendered pages are "
+        "followed, so views reached only through links are exported too."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.SITE_EXPORT_ROOT,
+            help="Directory to write to (default: SITE_EXPORT_ROOT).",
+        )
+        parser.add_argument(
+            "--jobs", type=int, default=os.cpu_count(), help="Worker processes."
+        )
+        parser.add_argument(
+            "--keep-stale",
+            action="store_true",
+            help="Leave pages from a previous export that no longer exist.",
+        )
+
+    def handle(self, *args, **options):
+        root = options["output"]
+        started = timezone.now()
+        exported = set()
+        failed = {}
+
+        seen = set()
+        wave = seed_urls()
+        # Forked workers would share the parent's open database connection
+        connections.close_all()
+        with ProcessPoolExecutor(options["jobs"], initializer=setup_worker) as pool:
+            while wave:
+                seen.update(wave)
+                links = set()
+
+                for url, status, html, found in pool.map(render_page, wave):
+                    if html is None:
+                        failed[url] = status
+                        continue
+                    write_page(root, url, html)
+                    exported.add(output_path(root, url))
+                    links.update(found)
+
+                wave = sorted(url for url in links - seen if is_exportable(url))
+
+        for url, status in sorted(failed.items()):
+            self.stderr.write(f"{status} {url}")
+
+        removed = 0 if options["keep_stale"] else self.remove_stale(root, exported)
+        # Edits queued before this run are in the pages just written
+        StalePage.objects.filter(marked_at__lt=started).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {len(exported)} pages to {root} "
+                f"({len(failed)} skipped, {removed} stale removed)."
+            )
+        )
+        if not exported:
+            raise CommandError("Nothing was exported.")
+
+    def remove_stale(self, root, exported):
+        removed = 0
+        for directory, _, files in os.walk(root):
+            if "index.html" in files:
+                path = os.path.join(directory, "index.html")
+                if path not in exported:
+                    os.remove(path)
+                    removed += 1
+        return removed
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from frontend import jobs
+from frontend.models import ImageJob
+
+
+class Command(BaseCommand):
+    help = "Run queued image optimization and rendition jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--batch", type=int, default=10, help="Jobs claimed per poll."
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=5, help="Seconds between empty polls."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            claimed = jobs.claim(options["batch"])
+
+            for job in claimed:
+                job = jobs.process(job)
+                if job.status == ImageJob.DONE:
+                    self.stdout.write(self.style.SUCCESS(str(job)))
+                else:
+                    self.stdout.write(self.style.WARNING(str(job)))
+
+            if not claimed:
+                if options["once"]:
+                    return
+                time.sleep(options["sleep"])
@@ -0,0 +1,58 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from frontend import export
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render exported pages queued by content edits "
+        "(SITE_EXPORT_INCREMENTAL) instead of running a full export_site."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.SITE_EXPORT_ROOT,
+            help="Export directory (default: SITE_EXPORT_ROOT).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Render the pages due now and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--batch", type=int, default=100, help="Pages claimed per poll."
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=1, help="Seconds between empty polls."
+        )
+
+    def handle(self, *args, **options):
+        root = options["output"]
+        checked = timezone.now()
+
+        while True:
+            # Scheduled articles go live without a save
+            now = timezone.now()
+            export.mark_stale(export.newly_published(checked))
+            checked = now
+
+            claimed = export.claim(options["batch"])
+            for url in claimed:
+                started = time.monotonic()
+                status = export.regenerate(root, url)
+                took = (time.monotonic() - started) * 1000
+                message = f"{status} {url} ({took:.0f} ms)"
+                if status == 200:
+                    self.stdout.write(self.style.SUCCESS(message))
+                else:
+                    self.stdout.write(self.style.WARNING(message))
+
+            if not claimed:
+                if options["once"]:
+                    return
+                time.sleep(options["sleep"])
@@ -0,0 +1,227 @@
+import os
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+from frontend.cache import bump_version
+from frontend.storage import (
+    HASHED_PREFIX,
+    HashedFileSystemStorage,
+    content_hash,
+    hashed_name,
+    hashed_storage,
+    is_hashed_name,
+)
+
+# --prune leaves files this young alone: an upload may be stored before the
+# row that points at it is saved.
+PRUNE_GRACE = timedelta(hours=1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move stored files onto content-hashed names (cas/...) and rewrite "
+        "the FileField values and renditions that point at them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without writing anything.",
+        )
+        parser.add_argument(
+            "--delete-old",
+            action="store_true",
+            help="Delete the original files once every row points at the copy.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete hashed files no row or renditions entry refers to.",
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options["dry_run"]
+        self.renamed = {}
+        self.stored = set()
+        self.totals = {"files": 0, "bytes": 0, "duplicates": 0, "saved": 0}
+
+        for model, fields in self.hashed_fields():
+            self.rehash_model(model, fields)
+
+        self.report()
+
+        if options["delete_old"] and not self.dry_run:
+            self.delete_old()
+        if options["prune"]:
+            self.prune()
+
+    # -----------------------------
+    # SELECTION
+    # -----------------------------
+    def hashed_fields(self):
+        """[(model, [FileField, ...])] for fields using HashedFileSystemStorage."""
+        found = []
+        for model in apps.get_models():
+            fields = [
+                field
+                for field in model._meta.get_fields()
+                if isinstance(field, models.FileField)
+                and isinstance(field.storage, HashedFileSystemStorage)
+            ]
+            if fields:
+                found.append((model, fields))
+        return found
+
+    # -----------------------------
+    # REHASH
+    # -----------------------------
+    def rehash_model(self, model, fields):
+        storage = fields[0].storage
+        # _base_manager: no ImageQuerySet.update() hook, these files are
+        # already optimized and only change name.
+        manager = model._base_manager
+
+        rewritten = False
+        for instance in manager.iterator():
+            changes = {}
+
+            for field in fields:
+                name = getattr(instance, field.name).name
+                if not name or is_hashed_name(name) or name == field.default:
+                    continue
+                new_name = self.rehash(storage, name)
+                if new_name:
+                    changes[field.name] = new_name
+
+            renditions = self.rehash_renditions(instance, storage)
+            if renditions is not None:
+                changes["renditions"] = renditions
+
+            if changes and not self.dry_run:
+                if hasattr(instance, "updated_at"):
+                    changes["updated_at"] = timezone.now()
+                manager.filter(pk=instance.pk).update(**changes)
+                rewritten = True
+
+        # update() sends no signals; drop the cached pages ourselves
+        if rewritten:
+            bump_version(model)
+
+    def rehash(self, storage, name):
+        """Copy `name` onto its hashed name and return that (None if missing)."""
+        if name in self.renamed:
+            return self.renamed[name]
+
+        if not storage.exists(name):
+            self.stderr.write(f"Missing file, skipped: {name}")
+            return None
+
+        with storage.open(name) as fp:
+            new_name = hashed_name(content_hash(fp), name)
+
+        size = storage.size(name)
+        self.totals["files"] += 1
+        self.totals["bytes"] += size
+
+        if new_name in self.stored or storage.exists(new_name):
+            self.totals["duplicates"] += 1
+            self.totals["saved"] += size
+        elif not self.dry_run:
+            with storage.open(name) as fp:
+                storage.save(name, File(fp, name))
+
+        self.renamed[name] = new_name
+        self.stored.add(new_name)
+        self.stdout.write(f"{name} -> {new_name}")
+        return new_name
+
+    def rehash_renditions(self, instance, storage):
+        """The instance's renditions with names hashed, or None if unchanged."""
+        renditions = getattr(instance, "renditions", None)
+        if not renditions:
+            return None
+
+        changed = False
+        updated = {}
+        for field_name, entry in renditions.items():
+            entry = dict(entry)
+            source = entry.get("source")
+            if source and not is_hashed_name(source) and source in self.renamed:
+                entry["source"] = self.renamed[source]
+                changed = True
+
+            formats = {}
+            for fmt, names in entry.get("formats", {}).items():
+                formats[fmt] = {}
+                for width, name in names.items():
+                    new_name = None
+                    if not is_hashed_name(name):
+                        new_name = self.rehash(storage, name)
+                    formats[fmt][width] = new_name or name
+                    changed = changed or new_name is not None
+            entry["formats"] = formats
+            updated[field_name] = entry
+
+        return updated if changed else None
+
+    # -----------------------------
+    # CLEANUP
+    # -----------------------------
+    def delete_old(self):
+        for name in self.renamed:
+            if hashed_storage.exists(name):
+                hashed_storage.purge(name)
+        self.stdout.write(f"Deleted {len(self.renamed)} original files.")
+
+    def referenced_names(self):
+        names = set()
+        for model, fields in self.hashed_fields():
+            has_renditions = any(f.name == "renditions" for f in model._meta.fields)
+            columns = [field.name for field in fields]
+            if has_renditions:
+                columns.append("renditions")
+
+            for row in model._base_manager.values(*columns).iterator():
+                for field in fields:
+                    names.add(row[field.name])
+                for entry in (row.get("renditions") or {}).values():
+                    for sized in entry.get("formats", {}).values():
+                        names.update(sized.values())
+        return names
+
+    def prune(self):
+        storage = hashed_storage
+        referenced = self.referenced_names()
+        cutoff = timezone.now() - PRUNE_GRACE
+        root = storage.path(HASHED_PREFIX)
+
+        pruned = 0
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, storage.location).replace(os.sep, "/")
+                if name in referenced or storage.get_modified_time(name) > cutoff:
+                    continue
+                if not self.dry_run:
+                    storage.purge(name)
+                pruned += 1
+
+        verb = "Would prune" if self.dry_run else "Pruned"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {pruned} unreferenced files."))
+
+    def report(self):
+        verb = "Would rehash" if self.dry_run else "Rehashed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {self.totals['files']} files "
+                f"({self.totals['bytes'] / 1024:.1f} KiB); "
+                f"duplicates: {self.totals['duplicates']} "
+                f"({self.totals['saved'] / 1024:.1f} KiB no longer stored twice)"
+            )
+        )
@@ -0,0 +1,285 @@
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, time
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from PIL import Image
+
+from frontend.images import (
+    apply_metadata,
+    build_renditions,
+    delete_renditions,
+    encode_image,
+    image_metadata,
+    is_optimized,
+    open_image,
+    pil_format,
+    replace_file,
+)
+from frontend.models import ImageOptimizeMixin
+
+# Re-encoding an already compressed file costs quality; only replace it
+# when that buys at least this fraction of its size.
+MIN_SAVING = 0.05
+
+
+def reoptimize(task):
+    """
+    Worker: re-encode one stored file and rebuild its renditions.
+    Touches storage only; the parent process writes the results to the DB.
+    Returns (bytes before, bytes after, (stored name, renditions entry,
+    metadata) or None).
+    """
+    model = apps.get_model(task["model"])
+    storage = model._meta.get_field(task["field"]).storage
+    policy = model.image_policy(task["field"])
+    name = task["name"]
+
+    before = storage.size(name)
+    with storage.open(name) as fp:
+        # Header only: the stored size, before draft mode scales it down
+        stored_size = Image.open(fp).size
+        fp.seek(0)
+        img = open_image(fp, policy.max_size, settings.IMAGE_MAX_PIXELS)
+        img.load()
+    img.thumbnail(policy.max_size, Image.LANCZOS)
+
+    content = encode_image(img, pil_format(name), policy.quality)
+    # A file larger than max_size is always replaced: the renditions entry
+    # records img's dimensions, which must be those of the stored file.
+    rewrite = stored_size != img.size or len(content) < before * (1 - MIN_SAVING)
+    after = len(content) if rewrite else before
+
+    if task["dry_run"]:
+        return before, after, None
+
+    if rewrite:
+        # A content-addressed storage hands back a new name for new bytes
+        name = replace_file(storage, name, content)
+
+    delete_renditions(task["old_entry"], storage)
+    entry = build_renditions(
+        img,
+        name,
+        storage,
+        policy.widths,
+        policy.formats,
+        policy.quality,
+    )
+    return before, after, (name, entry, image_metadata(img))
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-optimize stored images for every model using ImageOptimizeMixin "
+        "and rebuild their renditions, in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            help="Only this model (e.g. Project or frontend.Project). Repeatable.",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only files modified on or after this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be saved without writing anything.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Also reprocess files that already carry the optimized marker.",
+        )
+        parser.add_argument(
+            "--jobs", type=int, default=os.cpu_count(), help="Worker processes."
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=str(settings.BASE_DIR / ".reoptimize_images.checkpoint"),
+            help="File recording finished images so an interrupted run can resume.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint file.",
+        )
+
+    def handle(self, *args, **options):
+        since = self.parse_since(options["since"])
+        done = set() if options["restart"] else self.load_checkpoint(options)
+
+        tasks = self.collect(options, since, done)
+        if not tasks:
+            self.stdout.write("Nothing to do.")
+            return
+
+        self.stdout.write(
+            f"Processing {len(tasks)} files with {options['jobs']} workers"
+        )
+
+        totals = {"files": 0, "before": 0, "after": 0, "failed": 0}
+        with ProcessPoolExecutor(options["jobs"], initializer=django.setup) as pool:
+            futures = {pool.submit(reoptimize, task): task for task in tasks}
+
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    before, after, result = future.result()
+                except Exception as exc:
+                    totals["failed"] += 1
+                    self.stderr.write(f"FAILED {task['name']}: {exc}")
+                    continue
+
+                if result is not None:
+                    self.save_result(task, *result)
+                    done.add(task["name"])
+                    self.save_checkpoint(options, done)
+
+                totals["files"] += 1
+                totals["before"] += before
+                totals["after"] += after
+                self.stdout.write(f"{task['name']}: {before} -> {after} bytes")
+
+        self.report(totals, options["dry_run"])
+
+        if not options["dry_run"] and not totals["failed"]:
+            self.clear_checkpoint(options)
+
+    # -----------------------------
+    # SELECTION
+    # -----------------------------
+    def models(self, options):
+        models = [
+            model
+            for model in apps.get_models()
+            if issubclass(model, ImageOptimizeMixin)
+        ]
+        if not options["model"]:
+            return models
+
+        wanted = {label.lower() for label in options["model"]}
+        selected = [
+            model
+            for model in models
+            if model.__name__.lower() in wanted or model._meta.label_lower in wanted
+        ]
+        if not selected:
+            raise CommandError(
+                "No ImageOptimizeMixin model matches "
+                f"{', '.join(options['model'])}. Choose from "
+                f"{', '.join(model.__name__ for model in models)}."
+            )
+        return selected
+
+    def parse_since(self, value):
+        if not value:
+            return None
+        try:
+            day = datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise CommandError("--since must look like YYYY-MM-DD")
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def collect(self, options, since, done):
+        """
+        One task per distinct stored file. Several rows can point at the
+        same file; each of them gets the resulting renditions entry.
+        """
+        tasks = {}
+        rows = defaultdict(list)
+
+        for model in self.models(options):
+            for field_name in model.optimized_image_fields():
+                queryset = model.objects.exclude(**{field_name: ""}).exclude(
+                    **{f"{field_name}__isnull": True}
+                )
+                for instance in queryset.iterator():
+                    image_field = getattr(instance, field_name)
+                    name = image_field.name
+
+                    if name in done:
+                        continue
+                    if not options["force"] and is_optimized(image_field):
+                        continue
+                    if not image_field.storage.exists(name):
+                        self.stderr.write(f"Missing file, skipped: {name}")
+                        continue
+                    if since and image_field.storage.get_modified_time(name) < since:
+                        continue
+
+                    rows[name].append((model._meta.label, instance.pk, field_name))
+                    tasks.setdefault(
+                        name,
+                        {
+                            "model": model._meta.label,
+                            "field": field_name,
+                            "name": name,
+                            "old_entry": (instance.renditions or {}).get(field_name),
+                            "dry_run": options["dry_run"],
+                        },
+                    )
+
+        for name, task in tasks.items():
+            task["rows"] = rows[name]
+        return list(tasks.values())
+
+    # -----------------------------
+    # RESULTS
+    # -----------------------------
+    def save_result(self, task, name, entry, metadata):
+        for label, pk, field_name in task["rows"]:
+            instance = apps.get_model(label).objects.get(pk=pk)
+            setattr(instance, field_name, name)
+            instance.renditions = {**(instance.renditions or {}), field_name: entry}
+            apply_metadata(instance, field_name, metadata)
+            # The file is already in storage, so the guarded save() steps
+            # (slug, optimize_image) are all no-ops here.
+            instance.save(update_fields=instance.image_update_fields(field_name))
+
+    def report(self, totals, dry_run):
+        saved = totals["before"] - totals["after"]
+        verb = "Would save" if dry_run else "Saved"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {saved / 1024:.1f} KiB across {totals['files']} files "
+                f"({totals['before'] / 1024:.1f} -> {totals['after'] / 1024:.1f} KiB)"
+            )
+        )
+        if totals["failed"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{totals['failed']} files failed; "
+                    "rerun to resume from the checkpoint."
+                )
+            )
+
+    # -----------------------------
+    # CHECKPOINT
+    # -----------------------------
+    def load_checkpoint(self, options):
+        try:
+            with open(options["checkpoint"]) as fp:
+                return set(json.load(fp))
+        except FileNotFoundError:
+            return set()
+
+    def save_checkpoint(self, options, done):
+        tmp = f"{options['checkpoint']}.tmp"
+        with open(tmp, "w") as fp:
+            json.dump(sorted(done), fp)
+        os.replace(tmp, options["checkpoint"])
+
+    def clear_checkpoint(self, options):
+        if os.path.exists(options["checkpoint"]):
+            os.remove(options["checkpoint"])
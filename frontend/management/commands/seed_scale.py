@@ -0,0 +1,533 @@
+import io
+import random
+from datetime import UTC, date, datetime, timedelta
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import slugify
+from PIL import Image, ImageDraw
+
+from frontend.cache import bump_version
+from frontend.images import apply_metadata, build_renditions, image_metadata
+from frontend.models import (
+    Alumni,
+    BoardMember,
+    Branch,
+    Category,
+    ContractorRole,
+    ExternalAuthor,
+    MainCategory,
+    NewsArticle,
+    NewsImage,
+    People,
+    Project,
+    ProjectAward,
+    ProjectCategory,
+    ProjectContractor,
+    ProjectGalleryImage,
+    ProjectImage,
+    ProjectLeader,
+    ProjectTeamMember,
+    Publications,
+    Staff,
+    SubCategory,
+)
+from frontend.storage import hashed_storage
+
+# Dates count back from here rather than from today, so a seed always
+# produces the same rows.
+EPOCH = datetime(2025, 1, 1, 9, tzinfo=UTC)
+
+PROJECT_CATEGORIES = (
+    "Civic",
+    "Education",
+    "Health",
+    "Office",
+    "Residential",
+    "Industrial",
+    "Hospitality",
+    "Sports",
+    "Land",
+)
+CONTRACTOR_ROLES = (
+    "Main Contractor",
+    "Structural Engineer",
+    "Quantity Surveyor",
+    "Services Engineer",
+    "Landscape Architect",
+)
+NEWS_CATEGORIES = ("Projects", "Events", "Announcements", "Awards")
+PUBLICATION_TYPES = ("Annual Report", "Newsletter", "Research Paper")
+PEOPLE_CATEGORIES = ("consultants", "professional", "support")
+DEPARTMENTS = {
+    "Architecture": ("Design", "Conservation"),
+    "Engineering": ("Structures", "Building Services"),
+    "Quantity Surveying": ("Cost Planning", "Contracts"),
+    "Administration": ("Finance", "Human Resources"),
+}
+REGIONS = ("Greater Accra", "Ashanti", "Northern", "Volta", "Western", "Central")
+
+ADJECTIVES = ("New", "Regional", "Central", "Municipal", "National", "Community")
+BUILDINGS = (
+    "Hospital",
+    "Library",
+    "Secondary School",
+    "Office Complex",
+    "Stadium",
+    "Housing Estate",
+    "Market",
+    "Court Complex",
+    "Polyclinic",
+    "Hotel",
+)
+TOWNS = ("Accra", "Kumasi", "Tamale", "Takoradi", "Cape Coast", "Ho", "Koforidua", "Wa")
+FIRST_NAMES = ("Kwame", "Ama", "Kofi", "Akosua", "Yaw", "Abena", "Kojo", "Efua", "Esi")
+LAST_NAMES = ("Mensah", "Owusu", "Boateng", "Asante", "Osei", "Addo", "Appiah", "Ofori")
+WORDS = (
+    "design",
+    "site",
+    "client",
+    "structure",
+    "completion",
+    "community",
+    "budget",
+    "phase",
+    "handover",
+    "inspection",
+    "ministry",
+    "facility",
+)
+
+# Placeholder images: a few small, flat-colour JPEGs that every seeded row
+# points at. Each is stored (by hashed_storage) and run through the image
+# pipeline once; the rows share its renditions, so bulk_create() queues no
+# image jobs.
+PLACEHOLDERS = 12
+PLACEHOLDER_SIZES = {"landscape": (640, 400), "portrait": (400, 500)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic content at a chosen scale, for load "
+        "tests and benchmarks. The same --seed on the same database always "
+        "creates the same rows. Rows are added to what is already there."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=1000)
+        parser.add_argument("--news", type=int, default=1000)
+        parser.add_argument(
+            "--people",
+            type=int,
+            default=500,
+            help="People rows; staff, board members and alumni scale with it.",
+        )
+        parser.add_argument(
+            "--images", type=int, default=2000, help="Project gallery images."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Rows per bulk_create."
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.counts = {}
+
+        with transaction.atomic():
+            self.images = {
+                shape: self.placeholders(shape, size)
+                for shape, size in PLACEHOLDER_SIZES.items()
+            }
+            projects = self.seed_projects(options["projects"])
+            self.seed_gallery(projects, options["images"])
+            self.seed_staff(max(options["people"] // 4, 1))
+            self.seed_people(options["people"])
+            self.seed_governance(max(options["people"] // 20, 1))
+            self.seed_news(options["news"])
+            self.seed_publications(max(options["news"] // 5, 1))
+
+        # bulk_create() sends no signals: invalidate every cached page
+        for model in apps.get_app_config("frontend").get_models():
+            bump_version(model)
+
+        for label, count in self.counts.items():
+            self.stdout.write(f"{count:>8}  {label}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {sum(self.counts.values())} rows with seed {options['seed']}."
+            )
+        )
+
+    # -----------------------------
+    # HELPERS
+    # -----------------------------
+    def create(self, model, rows):
+        """bulk_create() in batches; returns the rows with their pks set."""
+        rows = model.objects.bulk_create(rows, batch_size=self.batch_size)
+        label = model.__name__
+        self.counts[label] = self.counts.get(label, 0) + len(rows)
+        return rows
+
+    def placeholders(self, shape, size):
+        """[(stored name, metadata, renditions entry)] for PLACEHOLDERS images."""
+        found = []
+        for n in range(PLACEHOLDERS):
+            hue = n * 360 // PLACEHOLDERS
+            img = Image.new("RGB", size, f"hsl({hue}, 45%, 55%)")
+            draw = ImageDraw.Draw(img)
+            draw.polygon(
+                [(0, size[1]), (size[0] // 2, size[1] // 3), (size[0], size[1])],
+                fill=f"hsl({hue}, 45%, 35%)",
+            )
+            buffer = io.BytesIO()
+            img.save(buffer, "JPEG", quality=70)
+            name = hashed_storage.save(
+                f"seed/{shape}-{n}.jpg", ContentFile(buffer.getvalue())
+            )
+            entry = build_renditions(img, name, hashed_storage)
+            found.append((name, image_metadata(img), entry))
+        return found
+
+    def image(self, instance, field_name, shape="landscape"):
+        name, metadata, entry = self.random.choice(self.images[shape])
+        setattr(instance, field_name, name)
+        apply_metadata(instance, field_name, metadata)
+        instance.renditions = {**(instance.renditions or {}), field_name: entry}
+        return instance
+
+    def person(self):
+        return f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+
+    def sentence(self, words=12):
+        text = " ".join(self.random.choice(WORDS) for _ in range(words))
+        return text.capitalize() + "."
+
+    def paragraphs(self, count=3):
+        return "".join(f"<p>{self.sentence(40)}</p>" for _ in range(count))
+
+    def unique_slugs(self, model, titles):
+        """Slugs for `titles` that clash with nothing stored or generated."""
+        taken = set(model.objects.values_list("slug", flat=True))
+        counters = {}
+        slugs = []
+        for title in titles:
+            base = slug = slugify(title)
+            while slug in taken:
+                counters[base] = counters.get(base, 0) + 1
+                slug = f"{base}-{counters[base]}"
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    def lookup(self, model, names):
+        """The rows named `names` (by name or slug), created if missing."""
+        slugged = any(field.name == "slug" for field in model._meta.fields)
+        existing = {}
+        for row in model.objects.all():
+            existing[row.name] = row
+            if slugged:
+                existing[row.slug] = row
+
+        missing = []
+        for name in names:
+            if name in existing or (slugged and slugify(name) in existing):
+                continue
+            row = model(name=name)
+            if slugged:
+                row.slug = slugify(name)
+            missing.append(row)
+        for row in self.create(model, missing):
+            existing[row.name] = row
+
+        return [existing.get(name) or existing[slugify(name)] for name in names]
+
+    # -----------------------------
+    # PROJECTS
+    # -----------------------------
+    def seed_projects(self, count):
+        if not count:
+            return []
+        categories = self.lookup(ProjectCategory, PROJECT_CATEGORIES)
+        roles = self.lookup(ContractorRole, CONTRACTOR_ROLES)
+        pool = max(count // 4, 1)
+        leaders = self.create(
+            ProjectLeader,
+            [ProjectLeader(full_name=self.person()) for _ in range(pool)],
+        )
+        members = self.create(
+            ProjectTeamMember,
+            [ProjectTeamMember(full_name=self.person()) for _ in range(pool)],
+        )
+
+        titles = [
+            f"{self.random.choice(ADJECTIVES)} {self.random.choice(BUILDINGS)}, "
+            f"{self.random.choice(TOWNS)}"
+            for _ in range(count)
+        ]
+        projects = []
+        for title, slug in zip(titles, self.unique_slugs(Project, titles)):
+            start = date(2000, 1, 1) + timedelta(days=self.random.randrange(9000))
+            done = self.random.random() < 0.7
+            projects.append(
+                self.image(
+                    Project(
+                        title=title,
+                        slug=slug,
+                        client=f"Ministry of {self.random.choice(WORDS).title()}",
+                        location=self.random.choice(TOWNS),
+                        little_text_details=self.paragraphs(2),
+                        project_coordinator=self.person(),
+                        total_floor_area=f"{self.random.randrange(200, 40000)} sqm",
+                        start_date=start,
+                        completed_date=start + timedelta(days=720) if done else None,
+                        category=self.random.choice(categories),
+                    ),
+                    "picture",
+                )
+            )
+        projects = self.create(Project, projects)
+
+        leader_links, member_links = [], []
+        awards, pictures, contractors = [], [], []
+        LeaderLink = Project.project_leaders.through
+        MemberLink = Project.other_team_members.through
+        for project in projects:
+            for leader in self.random.sample(leaders, min(2, len(leaders))):
+                leader_links.append(LeaderLink(project=project, projectleader=leader))
+            for member in self.random.sample(members, min(4, len(members))):
+                member_links.append(
+                    MemberLink(project=project, projectteammember=member)
+                )
+            for _ in range(self.random.randrange(3)):
+                awards.append(
+                    ProjectAward(
+                        project=project,
+                        year=self.random.randrange(2005, 2025),
+                        award_name=f"{self.random.choice(ADJECTIVES)} Design Award",
+                        awarded_by="Ghana Institute of Architects",
+                    )
+                )
+            for image_type, _ in ProjectImage.IMAGE_TYPE_CHOICES:
+                for _ in range(self.random.randrange(1, 4)):
+                    pictures.append(
+                        self.image(
+                            ProjectImage(project=project, image_type=image_type),
+                            "image",
+                        )
+                    )
+            for role in self.random.sample(roles, self.random.randrange(len(roles))):
+                contractors.append(
+                    ProjectContractor(
+                        project=project,
+                        role=role,
+                        company_name=f"{self.random.choice(LAST_NAMES)} & Partners",
+                    )
+                )
+
+        self.create(LeaderLink, leader_links)
+        self.create(MemberLink, member_links)
+        self.create(ProjectAward, awards)
+        self.create(ProjectImage, pictures)
+        self.create(ProjectContractor, contractors)
+        return projects
+
+    def seed_gallery(self, projects, count):
+        categories = [value for value, _ in ProjectGalleryImage.CATEGORY_CHOICES]
+        self.create(
+            ProjectGalleryImage,
+            [
+                self.image(
+                    ProjectGalleryImage(
+                        related_project=self.random.choice(projects)
+                        if projects and self.random.random() < 0.8
+                        else None,
+                        category=self.random.choice(categories),
+                        alt_text=self.sentence(6),
+                        is_active=self.random.random() < 0.95,
+                    ),
+                    "image",
+                )
+                for _ in range(count)
+            ],
+        )
+
+    # -----------------------------
+    # PEOPLE
+    # -----------------------------
+    def seed_staff(self, count):
+        sub_categories = []
+        for main_name, sub_names in DEPARTMENTS.items():
+            (main,) = self.lookup(MainCategory, [main_name])
+            existing = {sub.name: sub for sub in main.sub_categories.all()}
+            missing = [
+                SubCategory(main_category=main, name=name)
+                for name in sub_names
+                if name not in existing
+            ]
+            sub_categories += list(existing.values()) + self.create(
+                SubCategory, missing
+            )
+
+        self.create(
+            Staff,
+            [
+                self.image(
+                    Staff(
+                        sub_category=self.random.choice(sub_categories),
+                        name=self.person(),
+                        position=self.random.choice(BUILDINGS) + " Lead",
+                        region=self.random.choice(REGIONS),
+                        email=f"staff{n}@aesl.example",
+                        description=self.sentence(30),
+                    ),
+                    "image",
+                    "portrait",
+                )
+                for n in range(count)
+            ],
+        )
+
+    def seed_people(self, count):
+        self.create(
+            People,
+            [
+                self.image(
+                    People(
+                        name=self.person(),
+                        position=self.random.choice(("Principal", "Senior", "")),
+                        category=self.random.choice(PEOPLE_CATEGORIES),
+                        department=self.random.choice(list(DEPARTMENTS)),
+                        region=self.random.choice(REGIONS),
+                    ),
+                    "profile_picture",
+                    "portrait",
+                )
+                for _ in range(count)
+            ],
+        )
+
+    def seed_governance(self, count):
+        self.create(
+            BoardMember,
+            [
+                self.image(
+                    BoardMember(
+                        name=self.person(),
+                        about=self.paragraphs(2),
+                        joined_at=EPOCH - timedelta(days=self.random.randrange(4000)),
+                    ),
+                    "image",
+                    "portrait",
+                )
+                for _ in range(count)
+            ],
+        )
+        alumni = []
+        for _ in range(count):
+            alumnus = Alumni(
+                name=self.person(),
+                project_name=f"{self.random.choice(BUILDINGS)}, "
+                f"{self.random.choice(TOWNS)}",
+                about=self.paragraphs(2),
+                joined_at=EPOCH - timedelta(days=self.random.randrange(8000)),
+            )
+            self.image(alumnus, "image", "portrait")
+            alumni.append(self.image(alumnus, "project_image"))
+        self.create(Alumni, alumni)
+
+        self.create(
+            Branch,
+            [
+                Branch(
+                    name=f"{town} Office",
+                    address=f"{self.random.randrange(1, 200)} High Street, {town}",
+                    latitude=round(self.random.uniform(4.7, 11.1), 4),
+                    longitude=round(self.random.uniform(-3.2, 1.2), 4),
+                    email=f"{slugify(town)}@aesl.example",
+                )
+                for town in TOWNS[: min(count, len(TOWNS))]
+            ],
+        )
+
+    # -----------------------------
+    # NEWS AND PUBLICATIONS
+    # -----------------------------
+    def seed_news(self, count):
+        if not count:
+            return
+        categories = self.lookup(Category, NEWS_CATEGORIES)
+        self.create(
+            ExternalAuthor,
+            [
+                self.image(
+                    ExternalAuthor(name=self.person(), bio=self.sentence(20)),
+                    "photo",
+                    "portrait",
+                )
+                for _ in range(max(count // 50, 1))
+            ],
+        )
+
+        titles = [
+            f"{self.random.choice(ADJECTIVES)} {self.random.choice(BUILDINGS)} "
+            f"{self.random.choice(('opens', 'breaks ground', 'wins award'))} "
+            f"in {self.random.choice(TOWNS)}"
+            for _ in range(count)
+        ]
+        articles = []
+        for title, slug in zip(titles, self.unique_slugs(NewsArticle, titles)):
+            excerpt = self.sentence(20)
+            articles.append(
+                self.image(
+                    NewsArticle(
+                        title=title,
+                        slug=slug,
+                        category=self.random.choice(categories),
+                        excerpt=excerpt,
+                        content=self.paragraphs(5),
+                        is_published=self.random.random() < 0.9,
+                        publish_date=EPOCH
+                        - timedelta(hours=self.random.randrange(24 * 3650)),
+                        meta_title=title,
+                        meta_description=excerpt,
+                        tags=", ".join(self.random.sample(WORDS, 3)),
+                        is_featured=self.random.random() < 0.05,
+                    ),
+                    "featured_image",
+                )
+            )
+        articles = self.create(NewsArticle, articles)
+
+        self.create(
+            NewsImage,
+            [
+                self.image(
+                    NewsImage(article=article, caption=self.sentence(6), order=n),
+                    "image",
+                )
+                for article in articles
+                for n in range(self.random.randrange(4))
+            ],
+        )
+
+    def seed_publications(self, count):
+        self.create(
+            Publications,
+            [
+                self.image(
+                    Publications(
+                        title=f"{self.random.choice(PUBLICATION_TYPES)} "
+                        f"{self.random.randrange(2000, 2025)}",
+                        type=self.random.choice(PUBLICATION_TYPES),
+                        author="AESL",
+                    ),
+                    "publication_image",
+                    "portrait",
+                )
+                for _ in range(count)
+            ],
+        )
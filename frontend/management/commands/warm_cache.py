@@ -0,0 +1,142 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+
+from frontend.export import HREF, is_exportable, seed_urls
+
+# Response headers that say whether the page came out of a cache: ours,
+# then the usual CDN ones.
+CACHE_STATUS_HEADERS = ("X-View-Cache", "CF-Cache-Status", "X-Vercel-Cache", "X-Cache")
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every public page once so the first real visitor after a "
+        "deploy or cache flush gets a cached copy. Pages are rendered "
+        "in-process, or fetched from --target over HTTP."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            help="Base URL to fetch from (e.g. https://aesl.onrender.com). "
+            "Without it, pages are rendered in this process.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=4, help="Requests in flight at once."
+        )
+        parser.add_argument(
+            "--crawl",
+            action="store_true",
+            help="Also warm pages linked from the ones warmed.",
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=30, help="Seconds per HTTP request."
+        )
+
+    def handle(self, *args, **options):
+        self.target = (options["target"] or "").rstrip("/")
+        self.timeout = options["timeout"]
+
+        if not self.target and self.is_process_local():
+            self.stderr.write(
+                "The view cache is process-local memory: pages warmed here are "
+                "not seen by the web workers. Use --target, or a shared "
+                "VIEW_CACHE_BACKEND."
+            )
+
+        results = []
+        seen = set()
+        wave = seed_urls()
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            while wave:
+                seen.update(wave)
+                links = set()
+                for url, status, took, cache, found in pool.map(self.fetch, wave):
+                    results.append((url, status, took))
+                    self.report(url, status, took, cache)
+                    links.update(found)
+
+                if not options["crawl"]:
+                    break
+                wave = sorted(url for url in links - seen if is_exportable(url))
+
+        self.summary(results)
+
+    def is_process_local(self):
+        shared = caches["shared"]
+        return type(shared).__name__ in ("LocMemCache", "DummyCache")
+
+    def fetch(self, url):
+        """(url, status, ms, cache status, internal links) for one request."""
+        try:
+            if self.target:
+                status, headers, body, took = self.fetch_http(url)
+            else:
+                status, headers, body, took = self.fetch_local(url)
+        finally:
+            if not self.target:
+                connections.close_all()  # this worker thread's connections
+
+        cache = next(
+            (headers[name] for name in CACHE_STATUS_HEADERS if name in headers), "-"
+        )
+        links = HREF.findall(body) if status == 200 else []
+        return url, status, took, cache, links
+
+    def fetch_local(self, url):
+        client = Client(HTTP_HOST=settings.SITE_EXPORT_HOST)
+        start = time.perf_counter()
+        response = client.get(url, secure=True)
+        took = (time.perf_counter() - start) * 1000
+        body = response.content.decode(response.charset or "utf-8", "replace")
+        return response.status_code, response.headers, body, took
+
+    def fetch_http(self, url):
+        request = urllib.request.Request(
+            self.target + url, headers={"User-Agent": "aesl-warm-cache"}
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                status, headers = response.status, response.headers
+        except urllib.error.HTTPError as error:
+            body, status, headers = b"", error.code, error.headers
+        except urllib.error.URLError as error:
+            self.stderr.write(f"{url}: {error.reason}")
+            body, status, headers = b"", 0, {}
+        took = (time.perf_counter() - start) * 1000
+        return status, headers, body.decode("utf-8", "replace"), took
+
+    def report(self, url, status, took, cache):
+        line = f"{status:>3} {took:8.1f} ms  {cache:<8} {url}"
+        if status == 200:
+            self.stdout.write(line)
+        else:
+            self.stdout.write(self.style.WARNING(line))
+
+    def summary(self, results):
+        times = [took for _, status, took in results if status == 200]
+        failed = len(results) - len(times)
+        if not times:
+            self.stdout.write(self.style.ERROR(f"No page warmed ({failed} failed)."))
+            return
+
+        slowest = max(results, key=lambda result: result[2])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {len(times)} pages ({failed} failed): "
+                f"median {statistics.median(times):.1f} ms, "
+                f"total {sum(times) / 1000:.1f} s, "
+                f"slowest {slowest[0]} ({slowest[2]:.1f} ms)"
+            )
+        )
@@ -0,0 +1,113 @@
+"""
+Cookie-free public pages.
+
+GET/HEAD requests for the public site (views in settings.PUBLIC_PAGE_APPS)
+are the same for every visitor, so the middleware below leaves them alone:
+no cookies are read, the session is never loaded from the database, and
+no Set-Cookie or Vary: Cookie is added. Shared caches can then store them.
+
+Each class is a drop-in replacement for the Django middleware it extends
+and behaves exactly like it everywhere else, so /admin/ (and any POST)
+keeps sessions, CSRF checks and messages.
+"""
+
+from django.conf import settings
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.messages.storage.base import BaseStorage
+from django.contrib.sessions.backends.base import SessionBase
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import Resolver404, resolve
+
+
+def is_public(request):
+    if not settings.PUBLIC_PAGES_COOKIELESS or request.method not in ("GET", "HEAD"):
+        return False
+
+    if not hasattr(request, "_is_public_page"):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            request._is_public_page = False
+        else:
+            app = match.func.__module__.split(".")[0]
+            request._is_public_page = app in settings.PUBLIC_PAGE_APPS
+    return request._is_public_page
+
+
+class AnonymousSession(SessionBase):
+    """An always-empty session that is never loaded or saved."""
+
+    def _get_session(self, no_load=False):
+        # Reading it must not mark the response as varying on the cookie
+        if not hasattr(self, "_session_cache"):
+            self._session_cache = {}
+        return self._session_cache
+
+    _session = property(_get_session)
+
+    def exists(self, session_key):
+        return False
+
+    def create(self):
+        pass
+
+    def save(self, must_create=False):
+        pass
+
+    def delete(self, session_key=None):
+        pass
+
+    def load(self):
+        return {}
+
+    @classmethod
+    def clear_expired(cls):
+        pass
+
+
+class NullMessageStorage(BaseStorage):
+    """No messages in, none out."""
+
+    def _get(self, *args, **kwargs):
+        return [], True
+
+    def _store(self, messages, response, *args, **kwargs):
+        return []
+
+
+class PublicSessionMiddleware(SessionMiddleware):
+    def process_request(self, request):
+        if not is_public(request):
+            return super().process_request(request)
+        request.COOKIES = {}
+        request.session = AnonymousSession()
+
+    def process_response(self, request, response):
+        if is_public(request):
+            return response
+        return super().process_response(request, response)
+
+
+class PublicCsrfViewMiddleware(CsrfViewMiddleware):
+    # Safe methods are never checked, so public pages only skip the cookie.
+    def process_request(self, request):
+        if not is_public(request):
+            return super().process_request(request)
+
+    def process_response(self, request, response):
+        if is_public(request):
+            return response
+        return super().process_response(request, response)
+
+
+class PublicMessageMiddleware(MessageMiddleware):
+    def process_request(self, request):
+        if not is_public(request):
+            return super().process_request(request)
+        request._messages = NullMessageStorage(request)
+
+    def process_response(self, request, response):
+        if is_public(request):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-17 21:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0050_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StalePage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500, unique=True)),
+                ('due_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('marked_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Stale Page',
+                'verbose_name_plural': 'Stale Pages',
+                'ordering': ['due_at'],
+            },
+        ),
+    ]
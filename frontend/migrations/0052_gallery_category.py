@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-17 21:31
+
+from django.db import migrations, models
+
+CATEGORIES = {
+    "civic": "Civic and Culture",
+    "education": "Education",
+    "health": "Health",
+    "office": "Office and Retail",
+    "residential": "Residential",
+    "industrial": "Industrial and Infrastructure",
+    "hospitality": "Hospitality",
+    "sports": "Sport and Leisure",
+    "land": "Landscape and Planning",
+}
+
+# Free-text spellings seen before the field had choices
+ALIASES = {
+    **{label.lower(): value for value, label in CATEGORIES.items()},
+    "culture": "civic",
+    "retail": "office",
+    "residence": "residential",
+    "housing": "residential",
+    "infrastructure": "industrial",
+    "sport": "sports",
+    "leisure": "sports",
+    "landscape": "land",
+    "planning": "land",
+}
+
+
+def normalise_categories(apps, schema_editor):
+    ProjectGalleryImage = apps.get_model("frontend", "ProjectGalleryImage")
+    stored = ProjectGalleryImage.objects.values_list("category", flat=True)
+    for value in set(stored):
+        category = value.strip().lower()
+        if category not in CATEGORIES:
+            category = ALIASES.get(category, category)
+        if category != value:
+            ProjectGalleryImage.objects.filter(category=value).update(category=category)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0051_stale_page'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalise_categories, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='projectgalleryimage',
+            name='frontend_pr_categor_a35524_idx',
+        ),
+        migrations.AlterField(
+            model_name='projectgalleryimage',
+            name='category',
+            field=models.CharField(blank=True, choices=[('civic', 'Civic and Culture'), ('education', 'Education'), ('health', 'Health'), ('office', 'Office and Retail'), ('residential', 'Residential'), ('industrial', 'Industrial and Infrastructure'), ('hospitality', 'Hospitality'), ('sports', 'Sport and Leisure'), ('land', 'Landscape and Planning')], help_text='The gallery page this image appears on', max_length=100, verbose_name='Category'),
+        ),
+        migrations.AddIndex(
+            model_name='projectgalleryimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', '-uploaded_at'], name='gallery_category_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 6.0 on 2026-10-17 22:02
+
+import frontend.images
+import frontend.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0052_gallery_category'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='alumni',
+            name='image',
+            field=models.ImageField(default='default.jpg', max_length=300, storage=frontend.storage.HashedFileSystemStorage(), upload_to='board_members/', validators=[frontend.images.validate_pixel_budget], verbose_name='Profile Photo'),
+        ),
+        migrations.AlterField(
+            model_name='alumni',
+            name='project_image',
+            field=models.ImageField(blank=True, max_length=300, null=True, storage=frontend.storage.HashedFileSystemStorage(), upload_to='alumni_projects/', validators=[frontend.images.validate_pixel_budget], verbose_name='Project Image'),
+        ),
+        migrations.AlterField(
+            model_name='boardmember',
+            name='image',
+            field=models.ImageField(default='default.jpg', max_length=300, storage=frontend.storage.HashedFileSystemStorage(), upload_to='board_members/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='externalauthor',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=frontend.storage.HashedFileSystemStorage(), upload_to='news/authors/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='newsarticle',
+            name='featured_image',
+            field=models.ImageField(blank=True, null=True, storage=frontend.storage.HashedFileSystemStorage(), upload_to='news/images/%Y/%m/%d/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='newsimage',
+            name='image',
+            field=models.ImageField(storage=frontend.storage.HashedFileSystemStorage(), upload_to='news/gallery/%Y/%m/%d/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='people',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=frontend.storage.HashedFileSystemStorage(), upload_to='people/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='picture',
+            field=models.ImageField(blank=True, max_length=200, null=True, storage=frontend.storage.HashedFileSystemStorage(), upload_to='projects/main_pictures/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='projectgalleryimage',
+            name='image',
+            field=models.ImageField(help_text='Upload the main image for the gallery', max_length=350, storage=frontend.storage.HashedFileSystemStorage(), upload_to='projects-gallery/', validators=[frontend.images.validate_pixel_budget], verbose_name='Gallery Image'),
+        ),
+        migrations.AlterField(
+            model_name='projectimage',
+            name='image',
+            field=models.ImageField(storage=frontend.storage.HashedFileSystemStorage(), upload_to='projects/gallery/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='publications',
+            name='publication_image',
+            field=models.ImageField(blank=True, null=True, storage=frontend.storage.HashedFileSystemStorage(), upload_to='publications/images/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+        migrations.AlterField(
+            model_name='staff',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=frontend.storage.HashedFileSystemStorage(), upload_to='staff_images/', validators=[frontend.images.validate_pixel_budget]),
+        ),
+    ]
@@ -1,48 +1,252 @@
 import os
-from io import BytesIO
+from collections import defaultdict
+from functools import partial
 from unicodedata import category
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.files.base import ContentFile
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
 from PIL import Image
 
+from frontend.cache import CachedManager
+from frontend.images import (
+    MODERN_FORMATS,
+    RENDITION_WIDTHS,
+    ImagePolicy,
+    apply_metadata,
+    build_renditions,
+    delete_renditions,
+    encode_image,
+    image_metadata,
+    is_optimized,
+    metadata_fields,
+    open_image,
+    pil_format,
+    read_metadata,
+    replace_file,
+    validate_pixel_budget,
+)
+from frontend.storage import hashed_storage
+
 
 # ==============================
 # IMAGE OPTIMIZATION MIXIN
 # ==============================
 class ImageOptimizeMixin:
+    # Model-wide defaults; IMAGE_POLICIES overrides them per field, e.g.
+    # IMAGE_POLICIES = {"photo": ImagePolicy(max_size=(400, 400))}
     IMAGE_MAX_SIZE = (1200, 1200)
     IMAGE_QUALITY = 85
-
-    def optimize_image(self, image_field):
+    RENDITION_WIDTHS = RENDITION_WIDTHS
+    IMAGE_FORMATS = MODERN_FORMATS
+    IMAGE_POLICIES = {}
+
+    @classmethod
+    def image_policy(cls, field_name):
+        return cls.IMAGE_POLICIES.get(field_name) or ImagePolicy(
+            cls.IMAGE_MAX_SIZE,
+            cls.IMAGE_QUALITY,
+            cls.IMAGE_FORMATS,
+            cls.RENDITION_WIDTHS,
+        )
+
+    def optimize_images(self):
+        """optimize_image() every ImageField on the model; call from save()."""
+        for field_name in self.optimized_image_fields():
+            self.optimize_image(getattr(self, field_name))
+
+    def optimize_image(self, image_field, force=False, repointed=()):
+        """
+        `repointed`: pks of other rows that will be given this row's result
+        (optimize_stored_images), so they don't keep the old file alive.
+        """
         if not image_field:
             return
 
-        img = Image.open(image_field)
+        # Only freshly uploaded files go through the pipeline; anything
+        # already in storage was optimized when it was uploaded.
+        if not force and not self.needs_optimizing(image_field):
+            return
 
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
+        # With the queue enabled the upload is stored as-is and the
+        # `process_image_jobs` worker does the Pillow work later (see
+        # frontend/signals.py). Templates serve the original meanwhile.
+        if not force and settings.IMAGE_JOBS_ASYNC:
+            self._pending_image_fields = getattr(self, "_pending_image_fields", [])
+            self._pending_image_fields.append(image_field.field.name)
+            return
 
-        img.thumbnail(self.IMAGE_MAX_SIZE, Image.LANCZOS)
+        policy = self.image_policy(image_field.field.name)
+        img = self.open_image(image_field)
+        img.thumbnail(policy.max_size, Image.LANCZOS)
+
+        content = encode_image(img, pil_format(image_field.name), policy.quality)
+
+        if image_field._committed:
+            # Reprocessing a stored file: replace it (under a new content
+            # hash with hashed_storage), unless other rows still use it.
+            if self.is_shared_file(image_field, repointed):
+                image_field.name = image_field.storage.save(
+                    image_field.name, ContentFile(content)
+                )
+            else:
+                image_field.name = replace_file(
+                    image_field.storage, image_field.name, content
+                )
+        else:
+            # basename: a stored name already carries upload_to, and passing
+            # it back in would nest it (board_members/board_members/...).
+            image_field.save(
+                os.path.basename(image_field.name), ContentFile(content), save=False
+            )
+
+        self.record_renditions(image_field, img)
+
+    def is_shared_file(self, image_field, repointed=()):
+        """True if rows other than these still point at the stored file."""
+        field_name = image_field.field.name
+        return (
+            type(self)
+            ._base_manager.filter(**{field_name: image_field.name})
+            .exclude(pk__in=[self.pk, *repointed])
+            .exists()
+        )
+
+    def open_image(self, image_field):
+        policy = self.image_policy(image_field.field.name)
+        return open_image(image_field, policy.max_size, settings.IMAGE_MAX_PIXELS)
+
+    def needs_optimizing(self, image_field):
+        """
+        True only for a new upload that has not been written to storage yet.
+        Files already in storage are skipped unless optimize_image(force=True).
+        """
+        return bool(image_field) and not image_field._committed
+
+    def record_renditions(self, image_field, img):
+        """
+        Write the responsive widths and WebP/AVIF siblings for `image_field`
+        and remember them in `self.renditions`.
+        """
+        field_name = image_field.field.name
+        storage = image_field.storage
+        policy = self.image_policy(field_name)
+
+        self.renditions = dict(self.renditions or {})
+        delete_renditions(self.renditions.get(field_name), storage)
+
+        self.renditions[field_name] = build_renditions(
+            img,
+            image_field.name,
+            storage,
+            policy.widths,
+            policy.formats,
+            policy.quality,
+        )
+        apply_metadata(self, field_name, image_metadata(img))
+
+    def image_update_fields(self, field_name):
+        """
+        Columns the pipeline writes for `field_name` (for update_fields).
+        The field itself is included: a rewritten file gets a new hashed name.
+        """
+        fields = [
+            field_name,
+            "renditions",
+            *metadata_fields(type(self), field_name).values(),
+        ]
+        # The page showing the image changed too (conditional GET validators)
+        if hasattr(self, "updated_at"):
+            fields.append("updated_at")
+        return fields
+
+    @classmethod
+    def optimized_image_fields(cls):
+        return [
+            field.name
+            for field in cls._meta.get_fields()
+            if isinstance(field, models.ImageField)
+        ]
 
-        ext = os.path.splitext(image_field.name)[1].lower()
-        buffer = BytesIO()
+    @classmethod
+    def optimize_stored_images(cls, instances, field_names=None):
+        """
+        Optimize files that reached storage without going through save()
+        (bulk_create, update). Files that already carry renditions, the
+        field's shared default and names with no file behind them are left
+        alone. Rows sharing a file are processed once and all get the result.
+        """
+        from frontend import jobs  # jobs imports this module
+
+        for field_name in field_names or cls.optimized_image_fields():
+            field = cls._meta.get_field(field_name)
+            rows = defaultdict(list)
+            for instance in instances:
+                image_field = getattr(instance, field_name)
+                if instance.pk is None or not image_field:
+                    continue
+                if image_field.name == field.default or is_optimized(image_field):
+                    continue
+                if not image_field.storage.exists(image_field.name):
+                    continue
+                rows[image_field.name].append(instance)
+
+            for first, *others in rows.values():
+                if settings.IMAGE_JOBS_ASYNC:
+                    for instance in (first, *others):
+                        transaction.on_commit(
+                            partial(jobs.enqueue, instance, field_name)
+                        )
+                    continue
+
+                update_fields = first.image_update_fields(field_name)
+                first.optimize_image(
+                    getattr(first, field_name),
+                    force=True,
+                    repointed=[instance.pk for instance in others],
+                )
+                first.save(update_fields=update_fields)
+                entry = first.renditions[field_name]
+                for instance in others:
+                    setattr(instance, field_name, entry["source"])
+                    instance.renditions = {
+                        **(instance.renditions or {}),
+                        field_name: entry,
+                    }
+                    for column in metadata_fields(cls, field_name).values():
+                        setattr(instance, column, getattr(first, column))
+                    instance.save(update_fields=update_fields)
+
+
+class ImageQuerySet(models.QuerySet):
+    """
+    bulk_create() and update() never call save(), so files written through
+    them would skip the pipeline. Hand them to optimize_stored_images()
+    afterwards instead. bulk_update() goes through update().
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self.model.optimize_stored_images(objs)
+        return objs
+
+    def update(self, **kwargs):
+        field_names = [
+            name for name in kwargs if name in self.model.optimized_image_fields()
+        ]
+        pks = list(self.values_list("pk", flat=True)) if field_names else []
 
-        if ext in [".jpg", ".jpeg"]:
-            img.save(buffer, format="JPEG", quality=self.IMAGE_QUALITY, optimize=True)
-        elif ext == ".png":
-            img.save(buffer, format="PNG", optimize=True)
-        elif ext == ".webp":
-            img.save(buffer, format="WEBP", quality=self.IMAGE_QUALITY)
-        else:
-            img.save(buffer)
+        rows = super().update(**kwargs)
 
-        buffer.seek(0)
-        image_field.save(image_field.name, ContentFile(buffer.read()), save=False)
+        if pks:
+            self.model.optimize_stored_images(
+                self.model._default_manager.filter(pk__in=pks), field_names
+            )
+        return rows
 
 
 # ==============================
@@ -81,8 +285,14 @@ class Project(models.Model, ImageOptimizeMixin):
     location = models.CharField(max_length=300, default="Accra")
 
     picture = models.ImageField(
-        upload_to="projects/main_pictures/", blank=True, null=True, max_length=200
+        upload_to="projects/main_pictures/",
+        blank=True,
+        null=True,
+        max_length=200,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     little_text_details = models.TextField()
     project_coordinator = models.CharField(max_length=150)
@@ -104,6 +314,7 @@ class Project(models.Model, ImageOptimizeMixin):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     slug = models.SlugField(
         max_length=250,
@@ -113,6 +324,20 @@ class Project(models.Model, ImageOptimizeMixin):
     )
 
     # Update save method (add this if not already present)
+    objects = ImageQuerySet.as_manager()
+    # The detail page bundle (ProjectDetailView) and everything shown with it
+    cached = CachedManager(
+        depends_on=[
+            "frontend.ProjectCategory",
+            "frontend.ProjectImage",
+            "frontend.ProjectAward",
+            "frontend.ProjectLeader",
+            "frontend.ProjectTeamMember",
+            "frontend.ProjectContractor",
+            "frontend.ContractorRole",
+        ]
+    )
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
@@ -165,10 +390,21 @@ class ProjectImage(models.Model, ImageOptimizeMixin):
     project = models.ForeignKey(
         Project, on_delete=models.CASCADE, related_name="gallery"
     )
-    image = models.ImageField(upload_to="projects/gallery/")
+    image = models.ImageField(
+        upload_to="projects/gallery/",
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
+    )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     image_type = models.CharField(max_length=30, choices=IMAGE_TYPE_CHOICES)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ImageQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         if self.image:
             self.optimize_image(self.image)
@@ -178,13 +414,43 @@ class ProjectImage(models.Model, ImageOptimizeMixin):
         return f"{self.project.title} - {self.image_type}"
 
 
-class ProjectGalleryImage(models.Model):
+class ProjectGalleryImage(models.Model, ImageOptimizeMixin):
+    # One gallery page each (frontend/views.py)
+    CIVIC = "civic"
+    EDUCATION = "education"
+    HEALTH = "health"
+    OFFICE = "office"
+    RESIDENTIAL = "residential"
+    INDUSTRIAL = "industrial"
+    HOSPITALITY = "hospitality"
+    SPORTS = "sports"
+    LAND = "land"
+
+    CATEGORY_CHOICES = [
+        (CIVIC, "Civic and Culture"),
+        (EDUCATION, "Education"),
+        (HEALTH, "Health"),
+        (OFFICE, "Office and Retail"),
+        (RESIDENTIAL, "Residential"),
+        (INDUSTRIAL, "Industrial and Infrastructure"),
+        (HOSPITALITY, "Hospitality"),
+        (SPORTS, "Sport and Leisure"),
+        (LAND, "Landscape and Planning"),
+    ]
+
     image = models.ImageField(
         upload_to="projects-gallery/",
         verbose_name="Gallery Image",
         help_text="Upload the main image for the gallery",
         max_length=350,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
 
     related_project = models.ForeignKey(
         Project,
@@ -198,10 +464,10 @@ class ProjectGalleryImage(models.Model):
 
     category = models.CharField(
         max_length=100,
+        choices=CATEGORY_CHOICES,
         verbose_name="Category",
-        help_text="e.g. Education, Sport and Leisure, Culture, etc.",
+        help_text="The gallery page this image appears on",
         blank=True,
-        db_index=True,  # helps with filtering/sorting by category
     )
 
     alt_text = models.CharField(
@@ -220,22 +486,43 @@ class ProjectGalleryImage(models.Model):
         help_text="Uncheck to hide this image without deleting it",
     )
 
+    objects = ImageQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Project Gallery Image"
         verbose_name_plural = "Project Gallery Images"
         ordering = ["-uploaded_at"]  # newest first
         indexes = [
-            models.Index(fields=["category"]),
+            # A gallery page: one category, visible only, newest first. The
+            # visibility test is the index condition rather than a middle
+            # column: Django writes it as a bare `WHERE is_active`, which
+            # SQLite will not match to an indexed column, and would then
+            # sort every page in a temp B-tree.
+            models.Index(
+                fields=["category", "-uploaded_at"],
+                condition=models.Q(is_active=True),
+                name="gallery_category_idx",
+            ),
         ]
 
     def __str__(self):
         # Nice display in admin and shell
-        name = self.alt_text or self.category or "Untitled Image"
+        name = self.alt_text or self.get_category_display() or "Untitled Image"
         return f"{name} ({self.uploaded_at.strftime('%Y-%m-%d')})"
 
+    def save(self, *args, **kwargs):
+        # Gallery views match the category exactly
+        self.category = self.category.strip().lower()
+        # Dimensions and placeholder are read once, when a file is uploaded
+        if self.image and not self.image._committed:
+            apply_metadata(self, "image", read_metadata(self.image))
+        self.optimize_images()
+        super().save(*args, **kwargs)
+
     # Optional: better delete behavior (clean up file)
     def delete(self, *args, **kwargs):
         if self.image:
+            delete_renditions(self.renditions.get("image"), self.image.storage)
             self.image.delete(save=False)  # delete file from storage
         super().delete(*args, **kwargs)
 
@@ -277,6 +564,10 @@ class ProjectContractor(models.Model):
 class MainCategory(models.Model):
     name = models.CharField(max_length=150)
 
+    objects = models.Manager()
+    # The management page lists every category with its staff
+    cached = CachedManager(depends_on=["frontend.SubCategory", "frontend.Staff"])
+
     class Meta:
         verbose_name_plural = "Main Categories"
 
@@ -302,12 +593,26 @@ class Staff(models.Model, ImageOptimizeMixin):
         SubCategory, on_delete=models.CASCADE, related_name="staff"
     )
     name = models.CharField(max_length=150)
-    image = models.ImageField(upload_to="staff_images/", blank=True, null=True)
+    image = models.ImageField(
+        upload_to="staff_images/",
+        blank=True,
+        null=True,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
+    )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     position = models.CharField(max_length=100)
     region = models.CharField(max_length=100, default="Not a Regional Head")
     profession = models.CharField(max_length=100, default="Surveying")
     email = models.EmailField()
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ImageQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if self.image:
@@ -323,7 +628,14 @@ class Staff(models.Model, ImageOptimizeMixin):
 # ==============================
 class People(models.Model, ImageOptimizeMixin):
     name = models.CharField(max_length=255)
-    profile_picture = models.ImageField(upload_to="people/", blank=True, null=True)
+    profile_picture = models.ImageField(
+        upload_to="people/",
+        blank=True,
+        null=True,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
+    )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     position = models.CharField(max_length=100, default="position", blank=True)
     category = models.CharField(max_length=100, default="category")
     department = models.CharField(max_length=100, blank=True)
@@ -331,6 +643,9 @@ class People(models.Model, ImageOptimizeMixin):
     profession = models.CharField(max_length=100, default="Surveying")
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ImageQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if self.profile_picture:
@@ -350,8 +665,16 @@ class Publications(models.Model, ImageOptimizeMixin):
     author = models.CharField(max_length=255)
     download = models.FileField(upload_to="publications/", blank=True, null=True)
     publication_image = models.ImageField(
-        upload_to="publications/images/", blank=True, null=True
+        upload_to="publications/images/",
+        blank=True,
+        null=True,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ImageQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if self.publication_image:
@@ -368,12 +691,18 @@ class Publications(models.Model, ImageOptimizeMixin):
 class BoardMember(models.Model, ImageOptimizeMixin):
     name = models.CharField(max_length=150)
     image = models.ImageField(
-        upload_to="board_members/", default="default.jpg", max_length=300
+        upload_to="board_members/",
+        default="default.jpg",
+        max_length=300,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     position = models.CharField(max_length=255, default="Board Member")
     about = models.TextField()
     linkedin = models.URLField(blank=True, null=True)
     twitter = models.URLField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # Changed: no auto_now_add, editable date field
     joined_at = models.DateTimeField(
@@ -384,6 +713,8 @@ class BoardMember(models.Model, ImageOptimizeMixin):
         db_index=True,  # faster sorting
     )
 
+    objects = ImageQuerySet.as_manager()
+
     class Meta:
         ordering = ["-joined_at", "name"]  # newest joined first, then name
         verbose_name = "Board Member"
@@ -410,6 +741,9 @@ class Category(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = models.Manager()
+    cached = CachedManager()
+
     class Meta:
         verbose_name_plural = "Categories"
         ordering = ["name"]
@@ -423,7 +757,7 @@ class Category(models.Model):
         return self.name
 
 
-class NewsArticle(models.Model):
+class NewsArticle(models.Model, ImageOptimizeMixin):
     """Main news / article model"""
 
     title = models.CharField(max_length=255)
@@ -438,8 +772,13 @@ class NewsArticle(models.Model):
     )
 
     featured_image = models.ImageField(
-        upload_to="news/images/%Y/%m/%d/", blank=True, null=True
+        upload_to="news/images/%Y/%m/%d/",
+        blank=True,
+        null=True,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     excerpt = models.TextField(
         max_length=300, help_text="Short summary (displayed in lists/cards)"
@@ -459,7 +798,7 @@ class NewsArticle(models.Model):
     is_published = models.BooleanField(default=False)
     publish_date = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # SEO & sharing
     meta_title = models.CharField(max_length=200, blank=True)
@@ -474,6 +813,8 @@ class NewsArticle(models.Model):
     )
     views_count = models.PositiveIntegerField(default=0)
 
+    objects = ImageQuerySet.as_manager()
+
     class Meta:
         ordering = ["-publish_date"]
         indexes = [
@@ -492,6 +833,7 @@ class NewsArticle(models.Model):
         if not self.meta_description:
             self.meta_description = self.excerpt[:320]
 
+        self.optimize_images()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -502,33 +844,60 @@ class NewsArticle(models.Model):
         return self.publish_date.strftime("%d %b %Y")
 
 
-class NewsImage(models.Model):
+class NewsImage(models.Model, ImageOptimizeMixin):
     """Multiple images inside one article (gallery)"""
 
     article = models.ForeignKey(
         NewsArticle, on_delete=models.CASCADE, related_name="images"
     )
-    image = models.ImageField(upload_to="news/gallery/%Y/%m/%d/")
+    image = models.ImageField(
+        upload_to="news/gallery/%Y/%m/%d/",
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
+    )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     caption = models.CharField(max_length=255, blank=True)
     order = models.PositiveSmallIntegerField(default=0)
 
+    objects = ImageQuerySet.as_manager()
+
     class Meta:
         ordering = ["order"]
 
+    def save(self, *args, **kwargs):
+        self.optimize_images()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Image for {self.article.title}"
 
 
-class ExternalAuthor(models.Model):
+class ExternalAuthor(models.Model, ImageOptimizeMixin):
     """If you want news written by external people (not site users)"""
 
     name = models.CharField(max_length=150)
     title = models.CharField(
         max_length=100, blank=True
     )  # e.g. Senior Architect, Partner
-    photo = models.ImageField(upload_to="news/authors/", blank=True, null=True)
+    photo = models.ImageField(
+        upload_to="news/authors/",
+        blank=True,
+        null=True,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
+    )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True)
 
+    objects = ImageQuerySet.as_manager()
+
+    # Only ever shown as a small avatar
+    IMAGE_POLICIES = {"photo": ImagePolicy(max_size=(400, 400), widths=(80, 160))}
+
+    def save(self, *args, **kwargs):
+        self.optimize_images()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -563,6 +932,8 @@ class Alumni(models.Model, ImageOptimizeMixin):
         default="default.jpg",
         verbose_name="Profile Photo",
         max_length=300,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
     )
     project_image = models.ImageField(
         upload_to="alumni_projects/",
@@ -570,11 +941,15 @@ class Alumni(models.Model, ImageOptimizeMixin):
         null=True,
         verbose_name="Project Image",
         max_length=300,
+        storage=hashed_storage,
+        validators=[validate_pixel_budget],
     )
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     project_name = models.CharField(
         max_length=255, blank=True, verbose_name="Project Name"
     )
     about = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # Changed: no auto_now_add, editable date field
     joined_at = models.DateTimeField(
@@ -585,6 +960,8 @@ class Alumni(models.Model, ImageOptimizeMixin):
         db_index=True,  # faster sorting
     )
 
+    objects = ImageQuerySet.as_manager()
+
     class Meta:
         ordering = ["-joined_at", "name"]  # newest first, then name
         verbose_name = "Alumni"
@@ -606,3 +983,75 @@ class Alumni(models.Model, ImageOptimizeMixin):
 
     def get_absolute_url(self):
         return reverse("alumni_detail", args=[self.pk])
+
+
+# ==============================
+# IMAGE JOB QUEUE
+# ==============================
+class ImageJob(models.Model):
+    """Queued Pillow work for one image field of one row (see frontend/jobs.py)"""
+
+    OPTIMIZE = "optimize"
+    RENDITIONS = "renditions"
+
+    KIND_CHOICES = [
+        (OPTIMIZE, "Optimize and build renditions"),
+        (RENDITIONS, "Rebuild renditions only"),
+    ]
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=OPTIMIZE)
+    model_label = models.CharField(max_length=100)  # e.g. "frontend.Project"
+    object_id = models.PositiveIntegerField()
+    field_name = models.CharField(max_length=100)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        verbose_name = "Image Job"
+        verbose_name_plural = "Image Jobs"
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.model_label}#{self.object_id}.{self.field_name} ({self.status})"
+
+
+# ==============================
+# STATIC EXPORT QUEUE
+# ==============================
+class StalePage(models.Model):
+    """An exported page to re-render (see frontend/export.py)"""
+
+    url = models.CharField(max_length=500, unique=True)
+    # Pushed back by each new edit, so a burst of saves renders once
+    due_at = models.DateTimeField(default=timezone.now, db_index=True)
+    marked_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["due_at"]
+        verbose_name = "Stale Page"
+        verbose_name_plural = "Stale Pages"
+
+    def __str__(self):
+        return self.url
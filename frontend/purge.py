@@ -0,0 +1,57 @@
+"""
+CDN purging by surrogate key.
+
+Cacheable pages name the rows they show in Surrogate-Key / Cache-Tag
+headers (frontend/cache.py). When a row is saved or deleted, its keys are
+passed to the backend named by settings.EDGE_PURGE_BACKEND, a class with a
+purge(keys) method; a backend for a real CDN calls its purge-by-key API
+there.
+"""
+
+import logging
+from collections import deque
+from functools import cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class LocalPurgeBackend:
+    """
+    Stand-in for a CDN: remembers the most recent purges instead of sending
+    them anywhere. Used in development and by the tests.
+    """
+
+    def __init__(self, maxlen=1000):
+        self.purged = deque(maxlen=maxlen)
+
+    def purge(self, keys):
+        logger.debug("Purge %s", " ".join(keys))
+        self.purged.append(frozenset(keys))
+
+    def was_purged(self, key):
+        return any(key in keys for keys in self.purged)
+
+    def clear(self):
+        self.purged.clear()
+
+
+@cache
+def purge_backend():
+    return import_string(settings.EDGE_PURGE_BACKEND)()
+
+
+def purge(keys):
+    keys = sorted(set(keys))
+    if keys:
+        purge_backend().purge(keys)
+
+
+@receiver(setting_changed)
+def reset_purge_backend(setting, **kwargs):
+    if setting == "EDGE_PURGE_BACKEND":
+        purge_backend.cache_clear()
@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from frontend import export, jobs, purge
+from frontend.cache import (
+    bump_version,
+    cached_models,
+    instance_key,
+    is_versioned,
+    purge_keys,
+)
+from frontend.models import ImageOptimizeMixin
+
+
+@receiver(post_save)
+def enqueue_pending_images(sender, instance, **kwargs):
+    """
+    Queue the fields ImageOptimizeMixin deferred during save(). Runs after
+    the row exists (so it has a pk) and only once the transaction commits.
+    """
+    if not isinstance(instance, ImageOptimizeMixin):
+        return
+
+    pending = getattr(instance, "_pending_image_fields", None)
+    if not pending:
+        return
+    instance._pending_image_fields = []
+
+    for field_name in pending:
+        transaction.on_commit(
+            lambda field_name=field_name: jobs.enqueue(instance, field_name)
+        )
+
+
+# ==============================
+# VIEW CACHE INVALIDATION
+# ==============================
+# Sessions, admin log entries and ImageJob rows are written all the time
+# and nothing is cached on them, so only versioned models are bumped. The
+# views register theirs on import (frontend.export imports them above).
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_views(sender, **kwargs):
+    """Pages that depend on `sender` are rebuilt on their next request."""
+    if is_versioned(sender):
+        bump_version(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_cached_views_m2m(sender, instance, action, model, **kwargs):
+    if action.startswith("post_"):
+        for changed in (type(instance), model):
+            if is_versioned(changed):
+                bump_version(changed)
+
+
+# ==============================
+# EDGE CACHE PURGING
+# ==============================
+def purge_on_commit(keys):
+    transaction.on_commit(lambda: purge.purge(keys))
+
+
+@receiver(post_save)
+def purge_saved_row(sender, instance, raw=False, **kwargs):
+    if not raw and sender in cached_models:
+        purge_on_commit(purge_keys(instance))
+
+
+@receiver(pre_delete)
+def purge_deleted_row(sender, instance, **kwargs):
+    # Before the delete, while its m2m owners can still be looked up
+    if sender in cached_models:
+        purge_on_commit(purge_keys(instance))
+
+
+@receiver(m2m_changed)
+def purge_m2m_rows(sender, instance, action, model, pk_set, **kwargs):
+    if action.startswith("post_") and type(instance) in cached_models:
+        keys = {instance_key(type(instance), instance.pk)}
+        keys.update(instance_key(model, pk) for pk in pk_set or ())
+        purge_on_commit(keys)
+
+
+# ==============================
+# CONDITIONAL GET (updated_at)
+# ==============================
+def has_updated_at(model):
+    return any(field.name == "updated_at" for field in model._meta.concrete_fields)
+
+
+def touch(queryset):
+    # update() skips save() and signals, so this never cascades
+    queryset.update(updated_at=timezone.now())
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def touch_related_pages(sender, instance, **kwargs):
+    """
+    A page is dated by its main row's updated_at, but also shows related
+    rows: a project's gallery and awards, an article's images, the leaders
+    on a project. When one of those changes, move the main row's timestamp.
+    """
+    for field in sender._meta.concrete_fields:
+        if field.many_to_one and has_updated_at(field.related_model):
+            pk = getattr(instance, field.attname)
+            if pk is not None:
+                touch(field.related_model._base_manager.filter(pk=pk))
+
+    for relation in sender._meta.related_objects:
+        if relation.many_to_many and has_updated_at(relation.related_model):
+            touch(
+                relation.related_model._base_manager.filter(
+                    **{relation.field.name: instance}
+                )
+            )
+
+
+@receiver(m2m_changed)
+def touch_m2m_owner(sender, instance, action, **kwargs):
+    if action.startswith("post_") and has_updated_at(type(instance)):
+        touch(type(instance)._base_manager.filter(pk=instance.pk))
+
+
+# ==============================
+# STATIC EXPORT (incremental)
+# ==============================
+def exports_pages(model):
+    return settings.SITE_EXPORT_INCREMENTAL and (
+        model in export.PAGE_DEPENDENCIES or export.listing_pages(model)
+    )
+
+
+def queue_stale_pages(urls):
+    urls = set(urls)
+    if urls:
+        transaction.on_commit(lambda: export.mark_stale(urls))
+
+
+@receiver(pre_save)
+def remember_exported_pages(sender, instance, raw=False, **kwargs):
+    """
+    Pages the row is on before the save: a new slug or category moves it
+    off them, and they need rebuilding as much as the new ones.
+    """
+    if raw or instance.pk is None or not exports_pages(sender):
+        return
+    old = sender._base_manager.filter(pk=instance.pk).first()
+    instance._exported_pages = export.pages_for(old) if old is not None else []
+
+
+@receiver(post_save)
+def regenerate_exported_pages(sender, instance, raw=False, **kwargs):
+    if raw or not exports_pages(sender):
+        return
+    old = getattr(instance, "_exported_pages", [])
+    instance._exported_pages = []
+    queue_stale_pages([*old, *export.pages_for(instance)])
+
+
+@receiver(pre_delete)
+def regenerate_pages_on_delete(sender, instance, **kwargs):
+    # Before the delete, while the row's relations still resolve
+    if exports_pages(sender):
+        queue_stale_pages(export.pages_for(instance))
+
+
+@receiver(m2m_changed)
+def regenerate_pages_m2m(sender, instance, action, **kwargs):
+    if action.startswith("post_") and exports_pages(type(instance)):
+        queue_stale_pages(export.pages_for(instance))
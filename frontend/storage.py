@@ -0,0 +1,77 @@
+"""
+Content-addressed media storage.
+
+HashedFileSystemStorage ignores the name a file is saved under and stores
+it as cas/<aa>/<sha256><ext>, so identical bytes are written once however
+many rows (or upload_to folders) point at them, and a URL never changes
+meaning. Files under cas/ can therefore be cached for a year.
+
+Because one file may back several rows, delete() leaves hashed files
+alone; `python manage.py rehash_media --prune` removes the ones nothing
+refers to any more.
+"""
+
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASHED_PREFIX = "cas"
+HASHED_NAME = re.compile(rf"^{HASHED_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.\w+)?$")
+
+
+def content_hash(content):
+    """sha256 hex digest of a File (or any object with chunks() / read())."""
+    digest = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    if hasattr(content, "chunks"):
+        for chunk in content.chunks():
+            digest.update(chunk)
+    else:
+        for chunk in iter(lambda: content.read(64 * 1024), b""):
+            digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def hashed_name(digest, name):
+    """cas/<aa>/<digest><ext>, keeping the (lower-cased) extension of `name`."""
+    ext = os.path.splitext(name)[1].lower()
+    return f"{HASHED_PREFIX}/{digest[:2]}/{digest}{ext}"
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME.match(name or ""))
+
+
+@deconstructible(path="frontend.storage.HashedFileSystemStorage")
+class HashedFileSystemStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        name = hashed_name(content_hash(content), name)
+        if self.exists(name):
+            return name  # the same bytes are already stored
+        return super().save(name, content, max_length)
+
+    def delete(self, name):
+        # Hashed files may be shared by other rows; rehash_media --prune
+        # removes them once nothing refers to them. Legacy names are unique
+        # to their row and are deleted as usual.
+        if not is_hashed_name(name):
+            super().delete(name)
+
+    def purge(self, name):
+        """Really delete `name`, hashed or not."""
+        super().delete(name)
+
+
+hashed_storage = HashedFileSystemStorage()
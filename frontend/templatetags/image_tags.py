@@ -0,0 +1,93 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from frontend.images import modern_sources, srcset_candidates, stored_metadata
+
+register = template.Library()
+
+
+def to_srcset(candidates):
+    return ", ".join(f"{url} {width}w" for url, width in candidates)
+
+
+@register.simple_tag
+def image_attrs(image):
+    """
+    width/height and a placeholder background for an <img>, read from the
+    metadata columns so layout is reserved without opening the file:
+    <img src="{{ image.image.url }}" {% image_attrs image.image %} />
+    """
+    metadata = stored_metadata(image)
+    if metadata is None:
+        return ""
+
+    return format_html(
+        'width="{}" height="{}" style="background: {} url({}) center / cover no-repeat"',
+        metadata["width"],
+        metadata["height"],
+        metadata.get("color") or "transparent",
+        metadata.get("placeholder") or "",
+    )
+
+
+@register.simple_tag
+def picture(image, sizes="100vw", alt="", css_class="", loading="lazy"):
+    """
+    Render a <picture> for an ImageField: AVIF/WebP <source>s first, then an
+    <img> with a srcset in the original format, e.g.
+    {% picture project.picture sizes="(max-width: 600px) 100vw, 33vw" alt=project.title %}
+    Falls back to a plain <img src> when no renditions exist yet.
+    """
+    if not image:
+        return ""
+
+    candidates = srcset_candidates(image)
+    if not candidates:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" {} />',
+            image.url,
+            alt,
+            css_class,
+            loading,
+            image_attrs(image),
+        )
+
+    img = format_html(
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="{}" {} />',
+        image.url,
+        to_srcset(candidates),
+        sizes,
+        alt,
+        css_class,
+        loading,
+        image_attrs(image),
+    )
+
+    sources = modern_sources(image)
+    if not sources:
+        return img
+
+    return format_html(
+        "<picture>{}{}</picture>",
+        format_html_join(
+            "",
+            '<source type="{}" srcset="{}" sizes="{}" />',
+            ((mime, to_srcset(urls), sizes) for mime, urls in sources),
+        ),
+        img,
+    )
+
+
+@register.simple_tag
+def rendition_url(image, width):
+    """
+    URL of the smallest rendition at least `width` px wide, for places
+    that cannot use srcset (e.g. CSS background-image).
+    """
+    if not image:
+        return ""
+
+    for url, candidate_width in srcset_candidates(image):
+        if candidate_width >= int(width):
+            return url
+    return image.url
@@ -1,3 +1,1094 @@
-from django.test import TestCase
+import hashlib
+import importlib
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from PIL import Image
+
+from frontend import export, jobs, resize
+from frontend import urls as frontend_urls
+from frontend.cache import version_key
+from frontend.cache_backend import TieredCache
+from frontend.export import EXCLUDED_URL_NAMES, GALLERY_PAGES, seed_urls
+from frontend.images import ImagePolicy, is_optimized, open_image
+from frontend.management.commands import reoptimize_images
+from frontend.models import (
+    Alumni,
+    BoardMember,
+    Branch,
+    Category,
+    ContractorRole,
+    ExternalAuthor,
+    ImageJob,
+    MainCategory,
+    NewsArticle,
+    NewsImage,
+    People,
+    Project,
+    ProjectAward,
+    ProjectCategory,
+    ProjectContractor,
+    ProjectGalleryImage,
+    ProjectImage,
+    ProjectLeader,
+    ProjectTeamMember,
+    Publications,
+    StalePage,
+    Staff,
+    SubCategory,
+)
+from frontend.purge import purge_backend
+from frontend.storage import (
+    HashedFileSystemStorage,
+    hashed_storage,
+    is_hashed_name,
+)
+from frontend.views import NewsListView, ProjectView, gallery_images
+
+# Served straight from the test client: no HTTPS redirect, no page cache
+PUBLIC_PAGES = override_settings(
+    ALLOWED_HOSTS=["testserver"],
+    SECURE_SSL_REDIRECT=False,
+    VIEW_CACHE_ENABLED=False,
+)
+
+
+def make_project(title, related=1):
+    """A project with `related` of each gallery type, award, leader, etc."""
+    category, _ = ProjectCategory.objects.get_or_create(name="Health")
+    project = Project.objects.create(
+        title=title,
+        client="Ministry of Health",
+        little_text_details="Details",
+        project_coordinator="Coordinator",
+        total_floor_area="1200 sqm",
+        start_date=date(2020, 1, 1),
+        category=category,
+    )
+
+    for n in range(related):
+        project.project_leaders.add(
+            ProjectLeader.objects.create(full_name=f"{title} leader {n}")
+        )
+        project.other_team_members.add(
+            ProjectTeamMember.objects.create(full_name=f"{title} member {n}")
+        )
+        ProjectAward.objects.create(
+            project=project, year=2020 + n, award_name=f"Award {n}", awarded_by="GIA"
+        )
+        role = ContractorRole.objects.create(name=f"{title} role {n}")
+        ProjectContractor.objects.create(
+            project=project, role=role, company_name=f"Contractor {n}"
+        )
+        for image_type, _ in ProjectImage.IMAGE_TYPE_CHOICES:
+            # A stored name only: nothing is opened or resized
+            ProjectImage.objects.create(
+                project=project,
+                image=f"projects/gallery/{title}-{image_type}-{n}.jpg",
+                image_type=image_type,
+            )
+    return project
+
+
+@PUBLIC_PAGES
+class ProjectDetailQueriesTest(TestCase):
+    # Last-Modified aggregate, the project with its category, and one
+    # prefetch each for gallery, awards, leaders, team members, contractors
+    DETAIL_QUERIES = 7
+
+    def setUp(self):
+        caches["views"].clear()
+
+    def get_detail(self, project):
+        return self.client.get(project.get_absolute_url())
+
+    def test_query_count_does_not_grow_with_related_rows(self):
+        for project in (make_project("Small", 1), make_project("Large", 8)):
+            with self.assertNumQueries(self.DETAIL_QUERIES):
+                response = self.get_detail(project)
+            self.assertEqual(response.status_code, 200)
+
+    def test_gallery_is_split_by_type(self):
+        project = make_project("Split", 2)
+        response = self.get_detail(project)
+
+        for name, image_type in (
+            ("project_pictures", ProjectImage.PROJECT_PICTURE),
+            ("construction_pictures", ProjectImage.CONSTRUCTION_PICTURE),
+            (
+                "project_3d_visualization_picture",
+                ProjectImage.PROJECT_3D_VISUALIZATIONS_PICTURE,
+            ),
+        ):
+            images = response.context[name]
+            self.assertEqual(len(images), 2)
+            self.assertTrue(all(image.image_type == image_type for image in images))
+
+    def test_bundle_is_cached_until_a_related_row_changes(self):
+        project = make_project("Cached", 3)
+        self.get_detail(project)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_detail(project)
+        self.assertEqual(len(queries), 1)  # only the Last-Modified aggregate
+
+        ProjectAward.objects.create(
+            project=project, year=2030, award_name="New Award", awarded_by="GIA"
+        )
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.get_detail(project)
+        self.assertContains(response, "New Award")
+
+
+@PUBLIC_PAGES
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        caches["views"].clear()
+        self.project = make_project("Conditional")
+
+    def assertRevalidates(self, url, edit, text):
+        """`edit` changes the page at `url`: the old ETag no longer matches."""
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        edit()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertContains(response, text)
+
+    def test_category_rename_changes_project_pages(self):
+        category = self.project.category
+
+        def rename():
+            category.name = "Healthcare"
+            category.save()
+
+        self.assertRevalidates(reverse("projects"), rename, "Healthcare")
+
+    def test_contractor_role_rename_changes_project_detail(self):
+        role = ContractorRole.objects.get(project_contractors__project=self.project)
+
+        def rename():
+            role.name = "Lead Contractor"
+            role.save()
+
+        url = self.project.get_absolute_url()
+        self.assertRevalidates(url, rename, "Lead Contractor")
+
+
+@PUBLIC_PAGES
+class CookielessPublicPagesTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@aesl.example", "x")
+
+    def test_public_get_ignores_and_sets_no_cookies(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies, {})
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertEqual(response.wsgi_request.COOKIES, {})
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_admin_keeps_csrf_and_session_cookies(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(reverse("admin:login"))
+        self.assertIn("csrftoken", response.cookies)
+
+        response = client.post(
+            reverse("admin:login"),
+            {
+                "username": "admin",
+                "password": "x",
+                "csrfmiddlewaretoken": response.cookies["csrftoken"].value,
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("sessionid", response.cookies)
+
+    def test_post_without_csrf_token_is_forbidden(self):
+        client = Client(enforce_csrf_checks=True)
+        for url in (reverse("home"), reverse("admin:login")):
+            with self.subTest(url=url):
+                response = client.post(url, {"username": "admin", "password": "x"})
+                self.assertEqual(response.status_code, 403)
+
+    @override_settings(PUBLIC_PAGES_COOKIELESS=False)
+    def test_disabled_restores_sessions_on_public_pages(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.wsgi_request.COOKIES)
+        self.assertTrue(response.wsgi_request.user.is_authenticated)
+
+
+@PUBLIC_PAGES
+@override_settings(EDGE_PURGE_BACKEND="frontend.purge.LocalPurgeBackend")
+class EdgeCacheTest(TestCase):
+    def setUp(self):
+        self.project = make_project("Edge")
+        self.key = f"frontend.project:{self.project.pk}"
+        purge_backend().clear()
+
+    def test_detail_page_headers(self):
+        response = self.client.get(self.project.get_absolute_url())
+
+        self.assertEqual(
+            set(response["Surrogate-Key"].split()),
+            {self.key, "frontend.projectcategory", "frontend.contractorrole"},
+        )
+        self.assertEqual(
+            set(response["Cache-Tag"].split(",")),
+            set(response["Surrogate-Key"].split()),
+        )
+        cache_control = set(response["Cache-Control"].split(", "))
+        self.assertIn("public", cache_control)
+        self.assertIn(
+            f"s-maxage={settings.EDGE_CACHE_POLICY['s_maxage']}", cache_control
+        )
+
+    def test_saving_project_rows_purges_the_project(self):
+        rows = (
+            self.project,
+            self.project.gallery.first(),
+            self.project.project_leaders.first(),
+        )
+        for row in rows:
+            with self.subTest(model=type(row).__name__):
+                purge_backend().clear()
+                with self.captureOnCommitCallbacks(execute=True):
+                    row.save()
+                self.assertTrue(purge_backend().was_purged(self.key))
+
+
+class ResizedImageTest(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        image_cache = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, image_cache)
+        settings_override = override_settings(
+            MEDIA_ROOT=media, IMAGE_CACHE_DIR=image_cache, **PUBLIC_PAGES.options
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        os.makedirs(os.path.join(media, "photos"))
+        for name in ("a.jpg", "b.jpg"):
+            Image.new("RGB", (400, 300), "teal").save(
+                os.path.join(media, "photos", name)
+            )
+
+    def signed(self, value, name="photos/a.jpg"):
+        return f"{value}{resize.signer.sep}{resize.signature(value, name)}"
+
+    def test_resizes_and_revalidates(self):
+        url = resize.resized_url("photos/a.jpg", width=100)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(Image.open(io.BytesIO(response.content)).width, 100)
+
+        # Then from the disk cache, and 304 for the same ETag
+        cached = self.client.get(url)
+        self.assertEqual(b"".join(cached.streaming_content), response.content)
+        self.assertEqual(cached["ETag"], response["ETag"])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_bad_tokens_are_not_found(self):
+        token = resize.resized_url("photos/a.jpg", width=100).split("/")[2]
+        value, _, sig = token.rpartition(resize.signer.sep)
+        tampered = "A" if sig[-1] != "A" else "B"
+        for token, name in (
+            (f"{value}{resize.signer.sep}{sig[:-1]}{tampered}", "photos/a.jpg"),
+            (f"w2000{resize.signer.sep}{sig}", "photos/a.jpg"),
+            (value, "photos/a.jpg"),
+            (token, "photos/b.jpg"),  # replayed against another file
+            (self.signed("wide"), "photos/a.jpg"),
+        ):
+            with self.subTest(token=token, name=name):
+                url = reverse("resized_image", args=[token, name])
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_dimensions_are_capped(self):
+        params = resize.parse_token(self.signed("w99999-h99999"), "photos/a.jpg")
+        self.assertEqual(params["width"], resize.MAX_DIMENSION)
+        self.assertEqual(params["height"], resize.MAX_DIMENSION)
+
+    @override_settings(IMAGE_CACHE_MAX_BYTES=1000)
+    def test_cache_is_counted_not_walked_on_every_write(self):
+        with mock.patch.object(resize.os, "walk", wraps=os.walk) as walk:
+            for n in range(20):
+                resize.cache_put(resize.cache_key("w1", f"{n}.jpg"), b"x" * 100)
+
+        self.assertLess(walk.call_count, 10)
+        self.assertLessEqual(resize.cache_size, 1000)
+        self.assertEqual(resize.cache_size, resize.evict(1000))
+
+
+class ReoptimizeImagesTest(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_oversized_file_is_replaced_even_without_saving(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (800, 600), "teal").save(buffer, "JPEG", quality=30)
+        name = hashed_storage.save("big.jpg", ContentFile(buffer.getvalue()))
+        task = {
+            "model": "frontend.ExternalAuthor",
+            "field": "photo",
+            "name": name,
+            "old_entry": None,
+            "dry_run": False,
+        }
+
+        # No re-encode is ever worth it: only the size can force one
+        with mock.patch.object(reoptimize_images, "MIN_SAVING", 1):
+            _, _, (stored, entry, _) = reoptimize_images.reoptimize(task)
+
+        with hashed_storage.open(stored) as fp:
+            size = Image.open(fp).size
+        self.assertEqual(size, (400, 300))
+        self.assertEqual((entry["width"], entry["height"]), size)
+
+
+class ImageJobQueueTest(TestCase):
+    def setUp(self):
+        self.job = ImageJob.objects.create(
+            model_label="frontend.ExternalAuthor", object_id=1, field_name="photo"
+        )
+
+    def test_concurrent_claims_get_a_job_once(self):
+        rival = []
+
+        def claim_first(execute, sql, params, many, context):
+            # Another worker claims the job between our SELECT and UPDATE
+            if sql.startswith("UPDATE") and not rival:
+                rival.append(None)
+                rival.extend(jobs.claim())
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(claim_first):
+            claimed = jobs.claim()
+
+        self.assertEqual(claimed, [])
+        self.assertEqual(rival[1:], [self.job])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, ImageJob.RUNNING)
+        self.assertEqual(self.job.attempts, 1)
+
+    def test_failures_back_off_then_give_up(self):
+        with mock.patch.object(jobs, "run", side_effect=OSError("unreadable")):
+            for attempt in range(1, self.job.max_attempts + 1):
+                ImageJob.objects.filter(pk=self.job.pk).update(
+                    run_after=timezone.now()
+                )
+                (job,) = jobs.claim()
+                self.assertEqual(job.attempts, attempt)
+
+                started = timezone.now()
+                jobs.process(job)
+                job.refresh_from_db()
+                self.assertIn("unreadable", job.last_error)
+                if attempt < job.max_attempts:
+                    self.assertEqual(job.status, ImageJob.PENDING)
+                    backoff = timedelta(seconds=jobs.RETRY_BACKOFF * 2 ** (attempt - 1))
+                    self.assertAlmostEqual(
+                        job.run_after, started + backoff, delta=timedelta(seconds=5)
+                    )
+                    # Not due until then
+                    self.assertEqual(jobs.claim(), [])
+
+        self.assertEqual(job.status, ImageJob.FAILED)
+        self.assertEqual(jobs.claim(), [])
+
+
+class HashedStorageTest(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        self.storage = HashedFileSystemStorage(location=media)
+
+    def test_identical_content_is_stored_once(self):
+        first = self.storage.save("staff_images/a.JPG", ContentFile(b"same bytes"))
+        second = self.storage.save("people/b.jpg", ContentFile(b"same bytes"))
+        other = self.storage.save("people/c.jpg", ContentFile(b"other bytes"))
+
+        digest = hashlib.sha256(b"same bytes").hexdigest()
+        self.assertEqual(first, f"cas/{digest[:2]}/{digest}.jpg")
+        self.assertEqual(second, first)
+        self.assertNotEqual(other, first)
+        self.assertEqual(len(self.storage.listdir(f"cas/{digest[:2]}")[1]), 1)
+
+    def test_deleting_one_reference_keeps_the_shared_file(self):
+        name = self.storage.save("a.jpg", ContentFile(b"shared"))
+        self.storage.save("b.jpg", ContentFile(b"shared"))
+
+        self.storage.delete(name)
+        with self.storage.open(name) as fp:
+            self.assertEqual(fp.read(), b"shared")
+
+        self.storage.purge(name)
+        self.assertFalse(self.storage.exists(name))
+
+    def test_legacy_names_are_deleted(self):
+        legacy = FileSystemStorage(location=self.storage.location).save(
+            "people/old.jpg", ContentFile(b"legacy")
+        )
+        self.storage.delete(legacy)
+        self.assertFalse(self.storage.exists(legacy))
+
+
+@override_settings(**{**PUBLIC_PAGES.options, "VIEW_CACHE_ENABLED": True})
+class ViewCacheInvalidationTest(TestCase):
+    def setUp(self):
+        caches["views"].clear()
+        self.project = make_project("Invalidated")
+        self.url = reverse("projects")
+
+    def test_saving_a_dependency_serves_fresh_content(self):
+        self.client.get(self.url)
+        key = ProjectView().get_cache_key(RequestFactory().get(self.url))
+        self.assertEqual(self.client.get(self.url)["X-View-Cache"], "hit")
+
+        category = self.project.category
+        category.name = "Healthcare"
+        category.save()
+
+        self.assertNotEqual(
+            ProjectView().get_cache_key(RequestFactory().get(self.url)), key
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-View-Cache"], "miss")
+        self.assertContains(response, "Healthcare")
+
+    def test_unrelated_writes_bump_nothing(self):
+        self.client.get(self.url)
+        ImageJob.objects.create(
+            model_label="frontend.Project", object_id=self.project.pk, field_name="x"
+        )
+        User.objects.create_user("editor")
+
+        self.assertIsNone(caches["views"].get(version_key(ImageJob)))
+        self.assertIsNone(caches["views"].get(version_key(User)))
+        self.assertEqual(self.client.get(self.url)["X-View-Cache"], "hit")
+
+
+class TieredCacheTest(TestCase):
+    def setUp(self):
+        caches["shared"].clear()
+        self.cache = TieredCache(
+            "",
+            {
+                "OPTIONS": {
+                    "SHARED": "shared",
+                    "MAX_ENTRIES": 2,
+                    "LOCAL_TIMEOUT": 60,
+                    "BYPASS_PREFIXES": ["model-version:"],
+                }
+            },
+        )
+        self.shared = caches["shared"]
+
+    def test_local_copy_lags_until_it_expires(self):
+        now = time.monotonic()
+        with mock.patch("frontend.cache_backend.time.monotonic", return_value=now):
+            self.cache.set("page", "old")
+            self.shared.set("page", "new")  # another worker's write
+            self.assertEqual(self.cache.get("page"), "old")
+
+        later = now + 61
+        with mock.patch("frontend.cache_backend.time.monotonic", return_value=later):
+            self.assertEqual(self.cache.get("page"), "new")
+
+    def test_delete_and_bypassed_keys_read_the_shared_tier(self):
+        self.cache.set("page", "old")
+        self.cache.delete("page")
+        self.shared.set("page", "new")
+        self.assertEqual(self.cache.get("page"), "new")
+
+        self.cache.set("model-version:frontend.project", 1)
+        self.shared.set("model-version:frontend.project", 2)
+        self.assertEqual(self.cache.get("model-version:frontend.project"), 2)
+
+    def test_least_recently_used_is_dropped_locally(self):
+        for key in ("a", "b"):
+            self.cache.set(key, key)
+        self.cache.get("a")
+        self.cache.set("c", "c")
+
+        for key in ("a", "b", "c"):
+            self.shared.set(key, "shared")
+        # b was dropped; reading it back last keeps a and c local
+        self.assertEqual(
+            [self.cache.get(key) for key in ("a", "c", "b")], ["a", "c", "shared"]
+        )
+
+    def test_single_flight_computes_once(self):
+        computed = []
+        barrier = threading.Barrier(5)
+
+        def worker():
+            barrier.wait()
+            with self.cache.single_flight("page"):
+                if self.cache.get("page") is None:
+                    computed.append(None)
+                    time.sleep(0.05)
+                    self.cache.set("page", "rendered")
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(computed), 1)
+        self.assertEqual(self.cache.get("page"), "rendered")
+
+
+class CachedQuerySetTest(TestCase):
+    def setUp(self):
+        caches["views"].clear()
+        self.category = Category.objects.create(name="Events")
+
+    def names(self, queryset):
+        return [row.name for row in queryset]
+
+    def test_results_are_cached_until_a_save(self):
+        self.assertEqual(self.names(Category.cached.all()), ["Events"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(Category.cached.all()), ["Events"])
+
+        self.category.name = "Awards"
+        self.category.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names(Category.cached.all()), ["Awards"])
+
+    def test_results_are_cached_until_a_delete(self):
+        self.assertEqual(self.names(Category.cached.all()), ["Events"])
+        self.category.delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names(Category.cached.all()), [])
+
+    def test_saving_a_dependency_invalidates(self):
+        main = MainCategory.objects.create(name="Engineering")
+        queryset = MainCategory.cached.prefetch_related("sub_categories")
+        self.assertEqual(list(queryset.all())[0].sub_categories.count(), 0)
+
+        SubCategory.objects.create(main_category=main, name="Structures")
+        with self.assertNumQueries(2):
+            (main,) = queryset.all()
+        self.assertEqual(self.names(main.sub_categories.all()), ["Structures"])
+
+
+class StoredImagesTest(TestCase):
+    """Files written by bulk_create() and update(), which skip save()."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        settings_override = override_settings(MEDIA_ROOT=self.media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def store(self, name):
+        path = os.path.join(self.media, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Image.new("RGB", (300, 200), "teal").save(path)
+
+    def test_default_image_is_left_alone(self):
+        (member,) = BoardMember.objects.bulk_create([BoardMember(name="x", about="y")])
+        BoardMember.objects.filter(pk=member.pk).update(image="default.jpg")
+
+        self.store("default.jpg")
+        BoardMember.objects.bulk_create([BoardMember(name="z", about="y")])
+
+        self.assertTrue(os.path.exists(os.path.join(self.media, "default.jpg")))
+        for image, renditions in BoardMember.objects.values_list("image", "renditions"):
+            self.assertEqual((image, renditions), ("default.jpg", {}))
+
+    def test_missing_files_are_skipped(self):
+        BoardMember.objects.bulk_create(
+            [BoardMember(name="x", about="y", image="board_members/gone.jpg")]
+        )
+        self.assertEqual(BoardMember.objects.get().renditions, {})
+
+    def test_shared_file_is_processed_once_and_kept_while_used(self):
+        self.store("board_members/shared.jpg")
+        BoardMember.objects.create(
+            name="Outside", about="y", image="board_members/shared.jpg"
+        )
+        rows = BoardMember.objects.bulk_create(
+            [
+                BoardMember(name=name, about="y", image="board_members/shared.jpg")
+                for name in ("A", "B")
+            ]
+        )
+
+        optimized = BoardMember.objects.filter(pk__in=[row.pk for row in rows])
+        (name,) = set(optimized.values_list("image", flat=True))
+        self.assertTrue(is_hashed_name(name))
+        self.assertTrue(all(row.renditions["image"] for row in optimized))
+        # Still used by the row outside the batch
+        self.assertTrue(hashed_storage.exists("board_members/shared.jpg"))
+
+
+@override_settings(IMAGE_MAX_PIXELS=100 * 100)
+class PixelBudgetTest(TestCase):
+    def upload(self, size, fmt):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, "teal").save(buffer, fmt)
+        return SimpleUploadedFile(f"photo.{fmt.lower()}", buffer.getvalue())
+
+    def person(self, upload):
+        return People(
+            name="Ama Mensah",
+            position="Principal",
+            category="consultants",
+            profile_picture=upload,
+        )
+
+    def test_oversized_upload_is_a_validation_error(self):
+        person = self.person(self.upload((300, 200), "PNG"))
+        with self.assertRaises(ValidationError) as raised:
+            person.full_clean()
+        self.assertEqual(
+            raised.exception.error_dict["profile_picture"][0].code, "image_too_large"
+        )
+
+    def test_jpeg_within_budget_after_draft_scaling_is_accepted(self):
+        # 30000 pixels stored, but drafted to 1/2 (100x75) to fit 90x60
+        with mock.patch.dict(
+            People.IMAGE_POLICIES, {"profile_picture": ImagePolicy(max_size=(90, 60))}
+        ):
+            self.person(self.upload((200, 150), "JPEG")).full_clean()
+
+
+@PUBLIC_PAGES
+class FragmentCacheTest(TestCase):
+    def setUp(self):
+        # A real cache: DEBUG settings use a DummyCache for fragments
+        fragments = {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "fragment-tests",
+        }
+        settings_override = override_settings(
+            CACHES={**settings.CACHES, "fragments": fragments}
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        caches["fragments"].clear()
+
+    def test_project_card_follows_its_category_slug(self):
+        project = make_project("Card")
+        self.assertContains(self.client.get(reverse("projects")), "<p>health</p>")
+
+        ProjectCategory.objects.filter(pk=project.category_id).update(
+            slug="health-care"
+        )
+        response = self.client.get(reverse("projects"))
+        self.assertContains(response, "<p>health-care</p>")
+
+
+class OptimizeOnUploadTest(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (600, 400), "teal").save(buffer, "JPEG")
+        return SimpleUploadedFile("photo.jpg", buffer.getvalue())
+
+    def test_only_a_new_upload_runs_pillow(self):
+        with mock.patch("frontend.models.open_image", wraps=open_image) as opened:
+            author = ExternalAuthor.objects.create(name="Ama", photo=self.upload())
+            self.assertEqual(opened.call_count, 1)
+
+            author.bio = "Architect"
+            author.save()
+            ExternalAuthor.objects.get(pk=author.pk).save()
+            self.assertEqual(opened.call_count, 1)
+
+    def test_optimized_file_carries_the_marker(self):
+        author = ExternalAuthor.objects.create(name="Ama", photo=self.upload())
+        self.assertTrue(is_optimized(author.photo))
+        self.assertTrue(is_optimized(ExternalAuthor.objects.get(pk=author.pk).photo))
+
+        # Renditions recorded for another file don't count
+        author.photo.name = "news/authors/replaced.jpg"
+        self.assertFalse(is_optimized(author.photo))
+        self.assertFalse(is_optimized(ExternalAuthor(name="Kofi").photo))
+
+
+@PUBLIC_PAGES
+class IncrementalExportTest(TestCase):
+    def stale_after(self, edit):
+        StalePage.objects.all().delete()
+        with override_settings(SITE_EXPORT_INCREMENTAL=True):
+            with self.captureOnCommitCallbacks(execute=True):
+                edit()
+        return set(StalePage.objects.values_list("url", flat=True))
+
+    def test_an_edit_marks_the_pages_showing_the_row(self):
+        project = make_project("Stale")
+        sub = SubCategory.objects.create(
+            main_category=MainCategory.objects.create(name="Engineering"),
+            name="Structures",
+        )
+        staff = Staff.objects.create(
+            sub_category=sub,
+            name="Kofi",
+            image="staff_images/kofi.jpg",
+            position="Engineer",
+            email="kofi@aesl.example",
+            description="Description",
+        )
+
+        self.assertEqual(
+            self.stale_after(staff.save),
+            {reverse("management"), reverse("staff_detail", args=[staff.pk])},
+        )
+        award = project.awards.get()
+        self.assertEqual(
+            self.stale_after(award.save),
+            {reverse("project_detail", args=[project.slug])},
+        )
+
+    @override_settings(SITE_EXPORT_DEBOUNCE=2.0)
+    def test_a_second_edit_delays_the_rebuild(self):
+        start = timezone.now()
+
+        def at(seconds):
+            when = start + timedelta(seconds=seconds)
+            return mock.patch("frontend.export.timezone.now", return_value=when)
+
+        with at(0):
+            export.mark_stale(["/practice/management/"])
+        with at(1):
+            export.mark_stale(["/practice/management/"])
+
+        with at(2.5):
+            self.assertEqual(export.claim(), [])  # due at 3s, not 2s
+        with at(3):
+            self.assertEqual(export.claim(), ["/practice/management/"])
+            self.assertEqual(export.claim(), [])
+
+
+class GalleryCategoryTest(TestCase):
+    def make_image(self, category):
+        return ProjectGalleryImage.objects.create(
+            image="projects-gallery/gallery.jpg",
+            category=category,
+            alt_text="Gallery image",
+        )
+
+    def test_save_stores_the_slug(self):
+        image = self.make_image("  Health ")
+
+        image.refresh_from_db()
+        self.assertEqual(image.category, ProjectGalleryImage.HEALTH)
+        self.assertEqual(list(gallery_images("health")), [image])
+
+    def test_migration_maps_legacy_spellings(self):
+        migration = importlib.import_module("frontend.migrations.0052_gallery_category")
+        legacy = {
+            "Residence": "residential",
+            " Housing": "residential",
+            "Civic and Culture": "civic",
+            "SPORT": "sports",
+            "Landscape": "land",
+            "education": "education",
+        }
+        images = {}
+        for spelling in legacy:
+            image = self.make_image("placeholder")
+            # save() would already normalise it; write the old value directly
+            ProjectGalleryImage.objects.filter(pk=image.pk).update(category=spelling)
+            images[spelling] = image
+
+        migration.normalise_categories(apps, None)
+
+        for spelling, slug in legacy.items():
+            images[spelling].refresh_from_db()
+            self.assertEqual(images[spelling].category, slug, spelling)
+
+    def test_gallery_query_uses_the_partial_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("reads SQLite's query plan")
+
+        sql, params = gallery_images("health").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+
+        self.assertIn("gallery_category_idx", plan)
+        self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan)
+
+
+# ==============================
+# QUERY AND BYTE BUDGETS
+# ==============================
+# Every public route and admin changelist is rendered against the dataset
+# below and must stay within its budget of queries and response bytes. The
+# dataset has several rows behind every list, so a per-row lookup (an N+1)
+# blows the query budget rather than hiding in it.
+#
+# Budgets are (max queries, max bytes). Raise one only together with the
+# change that needs it.
+DEFAULT_BUDGET = (4, 40 * 1024)
+ROUTE_BUDGETS = {
+    "management": (4, 56 * 1024),
+    "news_list": (5, 40 * 1024),
+    "news_page": (5, 40 * 1024),
+    "news_detail": (5, 40 * 1024),
+    "project_detail": (7, 40 * 1024),
+}
+# Session, user, two counts and the page of rows, plus one query per
+# related-field filter in the sidebar.
+ADMIN_BUDGET = (6, 48 * 1024)
+ADMIN_BUDGETS = {
+    "frontend_newsarticle": (9, 48 * 1024),
+    "frontend_staff": (7, 48 * 1024),
+}
+
+SEED_PROJECTS = 12
+SEED_ROWS = 8  # of every other listed model
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def sql_fingerprint(sql):
+    """The statement with its literals replaced, so repeats group together."""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"%s|\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", sql)
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def query_origin():
+    """Where the running query came from: the innermost template tag or
+    variable being rendered, else the innermost line of project code (past
+    the queryset cache, which every cached fetch goes through)."""
+    code_line = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            origin = getattr(node, "origin", None)
+            token = getattr(node, "token", None)
+            if origin is not None and token is not None:
+                return f"{origin.template_name}:{token.lineno}"
+        if code_line is None and code.co_filename.startswith(APP_DIR):
+            if not code.co_filename.endswith(("tests.py", "cache.py")):
+                name = os.path.relpath(code.co_filename, settings.BASE_DIR)
+                code_line = f"{name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return code_line or "?"
+
+
+class QueryLog:
+    """A connection.execute_wrapper() that records each query's origin."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql_fingerprint(sql), query_origin()))
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def report(self):
+        grouped = Counter(self.queries).most_common()
+        return "\n".join(
+            f"  {count:>3} x [{origin}] {fingerprint}"
+            for (fingerprint, origin), count in grouped
+        )
+
+
+@PUBLIC_PAGES
+class RouteBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(SEED_PROJECTS):
+            make_project(f"Project {n}", 2)
+        projects = list(Project.objects.all())
+
+        categories = list(GALLERY_PAGES)
+        for n in range(SEED_ROWS * len(categories)):
+            ProjectGalleryImage.objects.create(
+                image=f"projects-gallery/gallery-{n}.jpg",
+                related_project=projects[n % len(projects)],
+                category=categories[n % len(categories)],
+                alt_text=f"Gallery image {n}",
+            )
+
+        for n in range(SEED_ROWS // 2):
+            main = MainCategory.objects.create(name=f"Department {n}")
+            for m in range(2):
+                sub = SubCategory.objects.create(main_category=main, name=f"Unit {m}")
+                for k in range(SEED_ROWS // 2):
+                    Staff.objects.create(
+                        sub_category=sub,
+                        name=f"Staff {n}.{m}.{k}",
+                        image=f"staff_images/staff-{n}-{m}-{k}.jpg",
+                        position="Quantity Surveyor",
+                        email=f"staff{n}{m}{k}@aesl.example",
+                        description="Description",
+                    )
+
+        for category in ("consultants", "professional", "support"):
+            for n in range(SEED_ROWS):
+                People.objects.create(
+                    name=f"{category} {n}",
+                    profile_picture=f"people/{category}-{n}.jpg",
+                    position="Principal",
+                    category=category,
+                    department="Architecture",
+                    region="Greater Accra",
+                )
+
+        for n in range(SEED_ROWS * 2):
+            Publications.objects.create(
+                title=f"Publication {n}",
+                type=("Annual Report", "Newsletter")[n % 2],
+                author="AESL",
+                publication_image=f"publications/images/publication-{n}.jpg",
+            )
+
+        news_categories = [
+            Category.objects.create(name=f"News category {n}") for n in range(3)
+        ]
+        for n in range(NewsListView.paginate_by + SEED_ROWS):
+            article = NewsArticle.objects.create(
+                title=f"Article {n}",
+                category=news_categories[n % len(news_categories)],
+                featured_image=f"news/images/article-{n}.jpg",
+                excerpt="Excerpt",
+                content="<p>Content</p>",
+                is_published=True,
+                publish_date=timezone.now() - timedelta(days=n + 1),
+                tags="design, health",
+            )
+            for order in range(2):
+                NewsImage.objects.create(
+                    article=article,
+                    image=f"news/gallery/article-{n}-{order}.jpg",
+                    order=order,
+                )
+
+        for n in range(SEED_ROWS):
+            BoardMember.objects.create(
+                name=f"Board member {n}",
+                image=f"board_members/member-{n}.jpg",
+                about="About",
+                joined_at=timezone.now() - timedelta(days=n),
+            )
+            Alumni.objects.create(
+                name=f"Alumnus {n}",
+                image=f"board_members/alumnus-{n}.jpg",
+                project_image=f"alumni_projects/project-{n}.jpg",
+                project_name=f"Alumni project {n}",
+                about="About",
+                joined_at=timezone.now() - timedelta(days=n),
+            )
+            Branch.objects.create(
+                name=f"Branch {n}",
+                address="Accra",
+                latitude=5.6 + n / 100,
+                longitude=-0.19 - n / 100,
+            )
+
+        cls.admin = User.objects.create_superuser("admin", "admin@aesl.example", "x")
+
+    def setUp(self):
+        for alias in ("views", "fragments"):
+            caches[alias].clear()
+
+    def measure(self, url):
+        log = QueryLog()
+        with connection.execute_wrapper(log):
+            response = self.client.get(url)
+        return response, log
+
+    def check_budget(self, url, budget):
+        max_queries, max_bytes = budget
+        response, log = self.measure(url)
+        self.assertEqual(response.status_code, 200, url)
+
+        size = len(response.content)
+        self.assertLessEqual(
+            len(log),
+            max_queries,
+            f"{url} ran {len(log)} queries (budget {max_queries}):\n{log.report()}",
+        )
+        self.assertLessEqual(
+            size, max_bytes, f"{url} rendered {size} bytes (budget {max_bytes})"
+        )
+
+    def test_every_public_url_is_measured(self):
+        measured = {resolve(url).url_name for url in seed_urls()}
+        named = {
+            pattern.name
+            for pattern in frontend_urls.urlpatterns
+            if pattern.name not in EXCLUDED_URL_NAMES
+        }
+        self.assertEqual(named - measured, set())
+
+    def test_excluded_categories_route_is_not_found(self):
+        # Unmeasured because it has no slug to show; see EXCLUDED_URL_NAMES
+        self.assertEqual(self.client.get(reverse("categories")).status_code, 404)
+
+    def test_public_routes(self):
+        for url in seed_urls():
+            name = resolve(url).url_name
+            with self.subTest(url=url):
+                self.check_budget(url, ROUTE_BUDGETS.get(name, DEFAULT_BUDGET))
+
+    def test_admin_changelists(self):
+        self.client.force_login(self.admin)
+        for model in admin.site._registry:
+            opts = model._meta
+            name = f"{opts.app_label}_{opts.model_name}"
+            url = reverse(f"admin:{name}_changelist")
+            with self.subTest(url=url):
+                self.check_budget(url, ADMIN_BUDGETS.get(name, ADMIN_BUDGET))
@@ -50,6 +50,7 @@ from frontend.views import (
     StaffDetailView,
     SupportTeamView,
     AlumniDetailView,
+    ResizedImageView,
 )
 
 urlpatterns = [
@@ -246,6 +247,11 @@ urlpatterns = [
         NewsListView.as_view(),
         name="news_list",
     ),
+    path(
+        "news/page/<int:page>/",
+        NewsListView.as_view(),
+        name="news_page",
+    ),
     path(
         "news/<int:pk>/",
         NewsDetailView.as_view(),
@@ -256,4 +262,9 @@ urlpatterns = [
         CategoryNewsListView.as_view(),
         name="categories",
     ),
+    path(
+        "img/<str:token>/<path:path>",
+        ResizedImageView.as_view(),
+        name="resized_image",
+    ),
 ]
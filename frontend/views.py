@@ -1,30 +1,47 @@
 import json
 import mimetypes
 import os
+from collections import defaultdict
 
 # from django.conf import settings
-from django.http import Http404, HttpResponse
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.core.signing import BadSignature
+from django.db.models import F, Min, Prefetch, Q
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.views.generic import DetailView, View
 from django.views.generic.list import ListView
 
+from frontend.cache import CachedViewMixin, ConditionalGetMixin
 from frontend.models import (
     BoardMember,
     Branch,
     Category,
+    ContractorRole,
     MainCategory,
     NewsArticle,
     People,
     Project,
+    ProjectAward,
+    ProjectCategory,
+    ProjectContractor,
     ProjectGalleryImage,
+    ProjectImage,
+    ProjectLeader,
+    ProjectTeamMember,
     Publications,
     Staff,
+    SubCategory,
     Alumni,
 )
+from frontend import resize
 
 
-class HomeView(View):
+class HomeView(CachedViewMixin, View):
+    cache_depends_on = [Branch]
+
     def get(self, request):
         # Fetch all branches for the map
         branches = Branch.objects.all().values(
@@ -47,14 +64,30 @@ class HomeView(View):
         return render(request, "frontend/home.html", context)
 
 
-class ProjectView(View):
+class ProjectView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [Project, ProjectCategory]
+    modified_model = Project
+
     def get(self, request):
-        projects = Project.objects.all()
+        # category is part of each card's fragment cache key
+        projects = Project.objects.select_related("category")
         context = {"title": "Projects", "projects": projects}
         return render(request, "frontend/projects.html", context)
 
 
-class ProjectDetailView(DetailView):
+class ProjectDetailView(ConditionalGetMixin, CachedViewMixin, DetailView):
+    cache_depends_on = [
+        Project,
+        ProjectCategory,
+        ProjectImage,
+        ProjectAward,
+        ProjectLeader,
+        ProjectTeamMember,
+        ProjectContractor,
+        ContractorRole,
+    ]
+    modified_model = Project
+
     model = Project
     template_name = "frontend/project_detail.html"
     context_object_name = "project"  # Default is 'object', but we can use 'project'
@@ -62,52 +95,76 @@ class ProjectDetailView(DetailView):
     slug_field = "slug"  # ← add this
     slug_url_kwarg = "slug"
 
+    def get_queryset(self):
+        # Everything the page shows, in one fixed set of queries however
+        # many images, awards or contractors the project has, and cached
+        # per project until one of cache_depends_on changes.
+        return Project.cached.select_related("category").prefetch_related(
+            "gallery",
+            "awards",
+            "project_leaders",
+            "other_team_members",
+            Prefetch(
+                "contractors",
+                queryset=ProjectContractor.objects.select_related("role"),
+            ),
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        project = self.get_object()
 
         # Separate gallery images
-        context["project_pictures"] = project.gallery.filter(image_type="project")
-        context["construction_pictures"] = project.gallery.filter(
-            image_type="construction"
-        )
-        context["project_3d_visualization_picture"] = project.gallery.filter(
-            image_type="project_3d_visualizations"
-        )
+        gallery = defaultdict(list)
+        for image in self.object.gallery.all():
+            gallery[image.image_type].append(image)
+        context["project_pictures"] = gallery[ProjectImage.PROJECT_PICTURE]
+        context["construction_pictures"] = gallery[ProjectImage.CONSTRUCTION_PICTURE]
+        context["project_3d_visualization_picture"] = gallery[
+            ProjectImage.PROJECT_3D_VISUALIZATIONS_PICTURE
+        ]
         # current page location
         context["title"] = "Projects"
 
         return context
 
 
-class PracticeView(View):
+class PracticeView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Practice"}
         return render(request, "frontend/practice.html", context)
 
 
-class SectorMinistryView(View):
+class SectorMinistryView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Sector Ministry"}
         return render(request, "frontend/sector_ministry.html", context)
 
 
-class CorporateGovernaceView(View):
+class CorporateGovernaceView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [BoardMember]
+    modified_model = BoardMember
+
     def get(self, request):
         board_members = BoardMember.objects.order_by("-joined_at")
         context = {"title": "Corporate Governance", "board_members": board_members}
         return render(request, "frontend/corporate_governance.html", context)
 
 
-class BoardMemberView(DetailView):
+class BoardMemberView(ConditionalGetMixin, CachedViewMixin, DetailView):
+    cache_depends_on = [BoardMember]
+    modified_model = BoardMember
+
     model = BoardMember
     template_name = "frontend/board_member.html"
     context_object_name = "board_member"
 
 
-class ManagementView(View):
+class ManagementView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [MainCategory, SubCategory, Staff]
+    modified_model = Staff
+
     def get(self, request):
-        categories = MainCategory.objects.prefetch_related("sub_categories__staff")
+        categories = MainCategory.cached.prefetch_related("sub_categories__staff")
 
         context = {
             "title": "Management",
@@ -116,7 +173,7 @@ class ManagementView(View):
         return render(request, "frontend/management.html", context)
 
 
-class ManagementDetailView(View):
+class ManagementDetailView(CachedViewMixin, View):
     def get(self, request):
         context = {
             "title": "Managing Director",
@@ -124,104 +181,116 @@ class ManagementDetailView(View):
         return render(request, "frontend/director.html", context)
 
 
-class StaffDetailView(DetailView):
+class StaffDetailView(ConditionalGetMixin, CachedViewMixin, DetailView):
+    cache_depends_on = [Staff, SubCategory, MainCategory]
+    modified_model = Staff
+
     model = Staff
     template_name = "frontend/staff_detail.html"
     context_object_name = "staff"
 
 
-class BoardChairmanView(View):
+class BoardChairmanView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [Alumni]
+    modified_model = Alumni
+
     def get(self, request):
         alumni = Alumni.objects.all()
         context = {"title": "Board Chairman", "alumni": alumni}
         return render(request, "frontend/board_chairman.html", context)
 
 
-class AlumniDetailView(DetailView):
+class AlumniDetailView(ConditionalGetMixin, CachedViewMixin, DetailView):
+    cache_depends_on = [Alumni]
+    modified_model = Alumni
+
     model = Alumni
     template_name = "frontend/alumni.html"
     context_object_name = "alumni"
 
 
-class ManagingDirectorView(View):
+class ManagingDirectorView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Managing Director"}
         return render(request, "frontend/managing_director.html", context)
 
 
-class DeputyManagingDirectorView(View):
+class DeputyManagingDirectorView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Deputy Managing Director"}
         return render(request, "frontend/deputy_managing_director.html", context)
 
 
-class DeputyIIManagingDirectorView(View):
+class DeputyIIManagingDirectorView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Deputy Managing Director"}
         return render(request, "frontend/deputy_ii_managing_director.html", context)
 
 
-class EngineeringView(View):
+class EngineeringView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Deputy Managing Director - Engineering"}
         return render(request, "frontend/engineering.html", context)
 
 
-class HistoryView(View):
+class HistoryView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "History"}
         return render(request, "frontend/history.html", context)
 
 
-class FunctionsView(View):
+class FunctionsView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Functions"}
         return render(request, "frontend/functions.html", context)
 
 
-class MandateView(View):
+class MandateView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Mandate"}
         return render(request, "frontend/mandate.html", context)
 
 
-class MissionVisionView(View):
+class MissionVisionView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Mission, Vision & Values"}
         return render(request, "frontend/mission_vision.html", context)
 
 
-class ServiceView(View):
+class ServiceView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Services"}
         return render(request, "frontend/services.html", context)
 
 
-class PrinciplesView(View):
+class PrinciplesView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Principles"}
         return render(request, "frontend/principles.html", context)
 
 
-class PeopleView(View):
+class PeopleView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "People"}
         return render(request, "frontend/people.html", context)
 
 
-class PrincipalConsultantsView(View):
+class PrincipalConsultantsView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "People"}
         return render(request, "frontend/principal__consultants.html", context)
 
 
-class SeniorConsultantsView(View):
+class SeniorConsultantsView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "People"}
         return render(request, "frontend/senior_consultants.html", context)
 
 
-class ConsultantsView(View):
+class ConsultantsView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [People]
+    modified_model = People
+
     def get(self, request):
         people = People.objects.all()
         consultants = people.filter(category__iexact="consultants")
@@ -229,14 +298,20 @@ class ConsultantsView(View):
         return render(request, "frontend/consultants.html", context)
 
 
-class SeniorProfessionalView(View):
+class SeniorProfessionalView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [People]
+    modified_model = People
+
     def get(self, request):
         senior_professionals = People.objects.all()
         context = {"title": "People", "senior_professionals": senior_professionals}
         return render(request, "frontend/senior_professional.html", context)
 
 
-class AssistantProfessionalsView(View):
+class AssistantProfessionalsView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [People]
+    modified_model = People
+
     def get(self, request):
         assistant_professionals = People.objects.all()
         context = {
@@ -246,7 +321,10 @@ class AssistantProfessionalsView(View):
         return render(request, "frontend/assistant_professional.html", context)
 
 
-class ProfessionalView(View):
+class ProfessionalView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [People]
+    modified_model = People
+
     def get(self, request):
         people = People.objects.all()
         professionals = people.filter(category__iexact="professional")
@@ -257,7 +335,10 @@ class ProfessionalView(View):
         return render(request, "frontend/professional.html", context)
 
 
-class SupportTeamView(View):
+class SupportTeamView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [People]
+    modified_model = People
+
     def get(self, request):
         people = People.objects.all()
         support_teams = people.filter(category__iexact="support")
@@ -268,18 +349,26 @@ class SupportTeamView(View):
         return render(request, "frontend/support_team.html", context)
 
 
-class NationalServiceView(View):
+class NationalServiceView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "People"}
         return render(request, "frontend/national_service.html", context)
 
 
-class CivicCultureView(View):
+def gallery_images(category):
+    """The visible images of one gallery page, newest first."""
+    return (
+        ProjectGalleryImage.objects.filter(category=category, is_active=True)
+        .select_related("related_project")
+        .order_by("-uploaded_at")
+    )
+
+
+class CivicCultureView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        civic_culture_images = ProjectGalleryImage.objects.filter(
-            category__iexact="civic",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        civic_culture_images = gallery_images(ProjectGalleryImage.CIVIC)
         context = {
             "title": "Civic and Culture",
             "civic_culture_images": civic_culture_images,
@@ -287,12 +376,11 @@ class CivicCultureView(View):
         return render(request, "frontend/civic_culture.html", context)
 
 
-class EducationView(View):
+class EducationView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        education_images = ProjectGalleryImage.objects.filter(
-            category__iexact="education",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        education_images = gallery_images(ProjectGalleryImage.EDUCATION)
 
         context = {
             "title": "Education",
@@ -301,23 +389,21 @@ class EducationView(View):
         return render(request, "frontend/education.html", context)
 
 
-class HealthView(View):
+class HealthView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        health_images = ProjectGalleryImage.objects.filter(
-            category__iexact="health",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        health_images = gallery_images(ProjectGalleryImage.HEALTH)
 
         context = {"title": "Health", "health_images": health_images}
         return render(request, "frontend/health.html", context)
 
 
-class OfficeRetailView(View):
+class OfficeRetailView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        office_retail_images = ProjectGalleryImage.objects.filter(
-            category__iexact="office",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        office_retail_images = gallery_images(ProjectGalleryImage.OFFICE)
         context = {
             "title": "Office Retail",
             "office_retail_images": office_retail_images,
@@ -325,22 +411,20 @@ class OfficeRetailView(View):
         return render(request, "frontend/office_retail.html", context)
 
 
-class ResidentialView(View):
+class ResidentialView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        residential_images = ProjectGalleryImage.objects.filter(
-            category__iexact="residential",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        residential_images = gallery_images(ProjectGalleryImage.RESIDENTIAL)
         context = {"title": "Residential", "residential_images": residential_images}
         return render(request, "frontend/residential.html", context)
 
 
-class IndustrialInfrastructureView(View):
+class IndustrialInfrastructureView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        industrial_images = ProjectGalleryImage.objects.filter(
-            category__iexact="industrial",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        industrial_images = gallery_images(ProjectGalleryImage.INDUSTRIAL)
         context = {
             "title": "Industrial Infrastructure",
             "industrial_images": industrial_images,
@@ -348,44 +432,47 @@ class IndustrialInfrastructureView(View):
         return render(request, "frontend/industrial_infrastructure.html", context)
 
 
-class HospitalityView(View):
+class HospitalityView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        hospitality_images = ProjectGalleryImage.objects.filter(
-            category__iexact="hospitality",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        hospitality_images = gallery_images(ProjectGalleryImage.HOSPITALITY)
         context = {"title": "Hospitality", "hospitality_images": hospitality_images}
         return render(request, "frontend/hospitality.html", context)
 
 
-class SportLesisureView(View):
+class SportLesisureView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        sports_images = ProjectGalleryImage.objects.filter(
-            category__iexact="sports",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        sports_images = gallery_images(ProjectGalleryImage.SPORTS)
         context = {"title": "Sport and Leisure", "sport_images": sports_images}
         return render(request, "frontend/sport_leisure.html", context)
 
 
-class LandScapePlanningView(View):
+class LandScapePlanningView(CachedViewMixin, View):
+    cache_depends_on = [ProjectGalleryImage, Project]
+
     def get(self, request):
-        land_images = ProjectGalleryImage.objects.filter(
-            category__iexact="land",
-            is_active=True,  # optional but recommended
-        ).order_by("-uploaded_at")  # newest first, or change ordering as you like
+        land_images = gallery_images(ProjectGalleryImage.LAND)
         context = {"title": "Landscaping and Planning", "land_images": land_images}
         return render(request, "frontend/landscaping_planning.html", context)
 
 
-class ProjectListView(View):
+class ProjectListView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [Project, ProjectCategory]
+    modified_model = Project
+
     def get(self, request):
-        projects = Project.objects.all()
+        projects = Project.objects.select_related("category")
         context = {"title": "Projects List", "projects": projects}
         return render(request, "frontend/project_list.html", context)
 
 
-class PublicationsView(View):
+class PublicationsView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [Publications]
+    modified_model = Publications
+
     def get(self, request):
         publications = Publications.objects.all()
         context = {"title": "Publication", "publications": publications}
@@ -420,7 +507,10 @@ class PublicationDownloadView(View):
         return response
 
 
-class PublicationTypeView(View):
+class PublicationTypeView(ConditionalGetMixin, CachedViewMixin, View):
+    cache_depends_on = [Publications]
+    modified_model = Publications
+
     def get(self, request, pub_type):
         # If the type doesn't exist, you can optionally show empty or 404
         publications = Publications.objects.filter(
@@ -436,22 +526,56 @@ class PublicationTypeView(View):
         return render(request, "frontend/publications_by_type.html", context)
 
 
-class RightToInformationView(View):
+class RightToInformationView(CachedViewMixin, View):
     def get(self, request):
         context = {"title": "Publication"}
         return render(request, "frontend/right_to_information.html", context)
 
 
-class NewsListView(ListView):
+def published_articles():
+    return NewsArticle.objects.filter(
+        is_published=True, publish_date__lte=timezone.now()
+    )
+
+
+def news_cache_timeout(default):
+    """
+    Cache news pages only until the next scheduled article goes live; its
+    publish_date passing is a change no signal reports.
+    """
+    upcoming = NewsArticle.objects.filter(
+        is_published=True, publish_date__gt=timezone.now()
+    ).aggregate(next=Min("publish_date"))["next"]
+    if upcoming is None:
+        return default
+    return min(default, int((upcoming - timezone.now()).total_seconds()) + 1)
+
+
+class NewsListView(ConditionalGetMixin, CachedViewMixin, ListView):
     """
     Displays a paginated list of published news articles
     """
 
+    cache_depends_on = [NewsArticle, Category]
+    modified_model = NewsArticle
+    # A scheduled article going live moves publish_date past "now" only
+    modified_fields = ("updated_at", "publish_date")
+
     model = NewsArticle
     template_name = "frontend/news.html"
     context_object_name = "articles"
     paginate_by = 10  # articles per page - adjust as needed
 
+    def get_cache_timeout(self):
+        return news_cache_timeout(super().get_cache_timeout())
+
+    def get_edge_cache_policy(self):
+        policy = super().get_edge_cache_policy()
+        return {**policy, "s_maxage": news_cache_timeout(policy["s_maxage"])}
+
+    def get_modified_queryset(self):
+        return published_articles()
+
     def get_queryset(self):
         # Only show published articles, ordered by publish date (newest first)
         return (
@@ -471,12 +595,12 @@ class NewsListView(ListView):
         ).order_by("-publish_date")[:3]
 
         # Add all active categories for sidebar/filter
-        context["categories"] = Category.objects.filter(is_active=True)
+        context["categories"] = Category.cached.filter(is_active=True)
 
         return context
 
 
-class NewsDetailView(DetailView):
+class NewsDetailView(ConditionalGetMixin, DetailView):
     """
     Displays a single news article
     """
@@ -487,6 +611,14 @@ class NewsDetailView(DetailView):
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    modified_model = NewsArticle
+    modified_fields = ("updated_at", "publish_date")
+
+    def get_modified_queryset(self):
+        # The article and the related articles listed under it
+        pk = self.kwargs["pk"]
+        return published_articles().filter(Q(pk=pk) | Q(category__articles=pk))
+
     def get_queryset(self):
         # Only allow access to published articles
         return NewsArticle.objects.filter(
@@ -496,9 +628,11 @@ class NewsDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Increment views count (simple version)
-        self.object.views_count += 1
-        self.object.save(update_fields=["views_count"])
+        # Increment views count. A queryset update() sends no post_save, so
+        # reading an article does not invalidate the cached news pages.
+        NewsArticle.objects.filter(pk=self.object.pk).update(
+            views_count=F("views_count") + 1
+        )
 
         # Related articles (same category, exclude current)
         context["related_articles"] = (
@@ -515,21 +649,35 @@ class NewsDetailView(DetailView):
         context["gallery_images"] = self.object.images.all().order_by("order")
 
         # All categories for sidebar
-        context["categories"] = Category.objects.filter(is_active=True)
+        context["categories"] = Category.cached.filter(is_active=True)
 
         return context
 
 
-class CategoryNewsListView(ListView):
+class CategoryNewsListView(ConditionalGetMixin, CachedViewMixin, ListView):
     """
     Displays news articles filtered by category
     """
 
+    cache_depends_on = [NewsArticle, Category]
+    modified_model = NewsArticle
+    modified_fields = ("updated_at", "publish_date")
+
     model = NewsArticle
     template_name = "news_list.html"  # reuse the same template
     context_object_name = "articles"
     paginate_by = 10
 
+    def get_cache_timeout(self):
+        return news_cache_timeout(super().get_cache_timeout())
+
+    def get_edge_cache_policy(self):
+        policy = super().get_edge_cache_policy()
+        return {**policy, "s_maxage": news_cache_timeout(policy["s_maxage"])}
+
+    def get_modified_queryset(self):
+        return published_articles().filter(category__slug=self.kwargs.get("slug"))
+
     def get_queryset(self):
         self.category = get_object_or_404(
             Category, slug=self.kwargs.get("slug"), is_active=True
@@ -548,6 +696,46 @@ class CategoryNewsListView(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["current_category"] = self.category
-        context["categories"] = Category.objects.filter(is_active=True)
+        context["categories"] = Category.cached.filter(is_active=True)
         context["page_title"] = f"{self.category.name} - News"
         return context
+
+
+class ResizedImageView(View):
+    """
+    Serves /img/<signed params>/<media path>: a resized copy of a file under
+    MEDIA_ROOT, rendered once and then read from the disk cache.
+    """
+
+    # The source mtime is part of the signed params, so a URL never changes
+    # meaning and browsers/CDNs may keep the response for a year.
+    cache_control = "public, max-age=31536000, immutable"
+
+    def get(self, request, token, path):
+        try:
+            params = resize.parse_token(token, path)
+            source = default_storage.path(path)
+        except (BadSignature, ValueError, SuspiciousFileOperation):
+            raise Http404("Image not found")
+
+        key = resize.cache_key(token, path)
+        etag = f'"{key}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponseNotModified()
+        else:
+            cached = resize.cache_get(key)
+            if cached is not None:
+                mime_type = resize.MIME_TYPES[
+                    params["fmt"] or resize.pil_format(path).lower()
+                ]
+                response = FileResponse(cached, content_type=mime_type)
+            else:
+                if not os.path.exists(source):
+                    raise Http404("Image not found")
+                content, mime_type = resize.render(source, params)
+                resize.cache_put(key, content)
+                response = HttpResponse(content, content_type=mime_type)
+
+        response["ETag"] = etag
+        response["Cache-Control"] = self.cache_control
+        return response